@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+hdob_records.py — count and time-stamp HDOB records without parsing them
+
+Functions:
+ - hdob_record_times(data) -> (hh, mm, ss) digit groups of every record in raw HDOB bytes
+ - count_hdob_records(hdob_file) -> number of records in an HDOB file
+
+Only the standard library is used, so the GUI can count records without loading
+matplotlib and cartopy (recon10s_plot).
+"""
+from __future__ import annotations
+import re
+from typing import List, Tuple
+
+# A whole HDOB record line as recon10s_plot.parse_hdob_file accepts it, over raw bytes: an
+# HHMM[SS] time token, then somewhere later a lat/lon token pair (LLMM[SS]H LLLMM[SS]H).
+# Only ASCII digits and space/tab separators are recognised; the parser's str.split() and
+# isdigit() also take Unicode digits and other whitespace (\x0b, \x0c, \x1c-\x1f, ...).
+HDOB_RECORD_RE = re.compile(
+    rb"^[ \t]*(\d\d)(\d\d)(\d\d)?[ \t]+(?:\S+[ \t]+)*?\d{4}(?:\d\d)?[NS][ \t]+\d{5}(?:\d\d)?[EW](?=\s|$)",
+    re.MULTILINE)
+
+def hdob_record_times(data) -> List[Tuple[bytes, bytes, bytes]]:
+    """(hh, mm, ss) digit groups of every record in raw HDOB bytes (a memory map will do); ss is b"" if absent."""
+    if data.find(b"\r") >= 0:
+        # a bare \r ends a line for the parser too (\r\n just gains an empty line)
+        data = data[:].replace(b"\r", b"\n")
+    return HDOB_RECORD_RE.findall(data)
+
+def count_hdob_records(hdob_file: str) -> int:
+    """Number of records parse_hdob_file would return for ASCII input, counted without parsing any fields."""
+    with open(hdob_file, "rb") as fh:
+        return len(hdob_record_times(fh.read()))
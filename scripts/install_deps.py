@@ -3,7 +3,7 @@ import subprocess
 import sys
 
 # List of required packages
-required_packages = ["numpy", "matplotlib", "cartopy", "requests"]
+required_packages = ["numpy", "matplotlib", "cartopy"]
 
 def install_package(package):
     """Install a package using pip"""
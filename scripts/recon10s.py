@@ -1,30 +1,33 @@
 #!/usr/bin/env python3
 """
-IWG1 → HDOB converter (multithreaded parsing)
+IWG1 → HDOB converter (multiprocess parsing)
 
 - Reads IWG1 ASCII stream/file/URL (per UCAR IWG1 packet spec).
 - Aggregates to HDOB intervals (supports 10, 30, 60, 120-second intervals).
 - Optional time-of-day window filtering (--start/--end).
-- Multithreaded parsing via --workers (defaults to 4).
+- Parallel parsing of large inputs via --workers processes (defaults to 4).
 """
 from __future__ import annotations
 import argparse
+import atexit
 import datetime as dt
+import functools
 import io
+import itertools
 import math
+import mmap
 import sys
 import os
-from collections import deque
-from typing import List, Optional, Tuple
+import re
+import urllib.request
+import warnings
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
 
 # concurrency
 import concurrent.futures
 
-try:
-    import requests
-except Exception:
-    requests = None
-
 # ----------------------------- constants & basic defs -----------------------------
 R_EARTH = 6371000.0
 G0 = 9.80665
@@ -34,6 +37,11 @@ P0_STD = 1013.25  # hPa
 T0_STD = 288.15  # K
 KTS_PER_MPS = 1.9438444924406
 
+UTC = dt.timezone.utc
+_EPOCH = dt.datetime(1970, 1, 1, tzinfo=UTC)
+_US = dt.timedelta(microseconds=1)
+_NAT = np.iinfo(np.int64).min  # int64 view of NaT; marks an unparseable timestamp
+
 BASE_FIELDS = [
     "Lat","Lon","GPS_MSL_Alt","WGS_84_Alt","Press_Alt","Radar_Alt","Grnd_Spd",
     "True_Airspeed","Indicated_Airspeed","Mach_Number","Vert_Velocity",
@@ -43,49 +51,40 @@ BASE_FIELDS = [
     "Sun_Elev_AC","Sun_Az_Grd","Sun_Az_AC",
 ]
 
-class IWG1Row:
-    __slots__ = ("t","lat","lon","ps_hpa","ga_m","temp_c","td_c","wspd_ms","wdir_deg")
-    def __init__(self, t: dt.datetime, lat: Optional[float], lon: Optional[float], ps_hpa: Optional[float],
-                 ga_m: Optional[float], temp_c: Optional[float], td_c: Optional[float],
-                 wspd_ms: Optional[float], wdir_deg: Optional[float]):
-        self.t = t
-        self.lat = lat
-        self.lon = lon
-        self.ps_hpa = ps_hpa
-        self.ga_m = ga_m
-        self.temp_c = temp_c
-        self.td_c = td_c
-        self.wspd_ms = wspd_ms
-        self.wdir_deg = wdir_deg
-
 # ----------------------------- parsing helpers -----------------------------
 def parse_float(x: str) -> Optional[float]:
+    # blank is the common missing value in IWG1 feeds: answer it without raising
+    x = x.strip()
+    if not x:
+        return None
     try:
-        x = x.strip()
-        if x == "" or x.lower() in {"nan","inf","+inf","-inf"}:
-            return None
-        return float(x)
-    except Exception:
+        v = float(x)
+    except ValueError:
         return None
+    return v if math.isfinite(v) else None
+
+# YYYY-MM-DD[T ]HH:MM:SS[.f] and the compact YYYYMMDD[T ]HHMMSS[.f] variants
+# (fallback for what fromisoformat rejects, e.g. compact stamps before Python 3.11)
+_TIME_RE = re.compile(r"^(\d{4})-?(\d{2})-?(\d{2})[T ](\d{2}):?(\d{2}):?(\d{2})(?:\.(\d+))?$")
 
 def parse_time(s: str) -> dt.datetime:
     s = s.strip()
-    fmt_variants = [
-        "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y%m%dT%H%M%S", "%Y%m%d %H%M%S",
-        "%Y%m%dT%H%M%S.%f", "%Y-%m-%dT%H:%M:%S.%f",
-    ]
-    for f in fmt_variants:
-        try:
-            return dt.datetime.strptime(s, f).replace(tzinfo=dt.timezone.utc)
-        except Exception:
-            pass
+    # C-level ISO parser first: it covers the common extended form (and zone offsets)
     try:
         t = dt.datetime.fromisoformat(s)
-        if t.tzinfo is None:
-            t = t.replace(tzinfo=dt.timezone.utc)
-        return t.astimezone(dt.timezone.utc)
-    except Exception:
-        raise ValueError(f"Unrecognized time format: {s}")
+    except ValueError:
+        pass
+    else:
+        return t.replace(tzinfo=UTC) if t.tzinfo is None else t.astimezone(UTC)
+    m = _TIME_RE.match(s)
+    if m:
+        y, mo, d, hh, mm, ss, frac = m.groups()
+        try:
+            return dt.datetime(int(y), int(mo), int(d), int(hh), int(mm), int(ss),
+                               int(frac.ljust(6, "0")[:6]) if frac else 0, tzinfo=UTC)
+        except ValueError:
+            pass
+    raise ValueError(f"Unrecognized time format: {s}")
 
 def iwg1_iter_lines_from_text(text: str):
     for raw in text.splitlines():
@@ -99,161 +98,49 @@ def iwg1_iter_lines_from_text(text: str):
             continue
         yield parts
 
-def parse_iwg1_row(parts: List[str]) -> Optional[IWG1Row]:
-    try:
-        t = parse_time(parts[1])
-        get = lambda idx: parse_float(parts[idx]) if idx < len(parts) else None
-        lat = get(2)
-        lon = get(3)
-        gps_msl_alt_m = get(4)
-        ga_m = gps_msl_alt_m if gps_msl_alt_m is not None else get(5)
-        ps_hpa = get(23)
-        temp_c = get(20)
-        td_c = get(21)
-        wspd_ms = get(26)
-        wdir_deg = get(27)
-        return IWG1Row(t, lat, lon, ps_hpa, ga_m, temp_c, td_c, wspd_ms, wdir_deg)
-    except Exception:
-        return None
-
-# ----------------------------- physics helpers -----------------------------
-def isa_z_from_p(ps_hpa: float) -> float:
-    expo = (R_D * LAPSE) / G0
-    z = (T0_STD / LAPSE) * (1.0 - (ps_hpa / P0_STD) ** expo)
-    return max(0.0, z)
-
-def d_value_m(ga_m: float, ps_hpa: float) -> Optional[int]:
-    if ga_m is None or ps_hpa is None:
-        return None
-    z_std = isa_z_from_p(ps_hpa)
-    d = ga_m - z_std
-    return int(round(d))
-
-def extrapolate_surface_pressure(ps_hpa: float, z_m: float, t_c: Optional[float]) -> Optional[float]:
-    if ps_hpa is None or z_m is None:
-        return None
-    if t_c is None:
-        z_est = isa_z_from_p(ps_hpa)
-        T_z = T0_STD - LAPSE * z_est
-    else:
-        T_z = t_c + 273.15
-    T_bar = T_z + 0.5 * LAPSE * z_m
-    if T_bar <= 0:
-        return None
-    p0 = ps_hpa * math.exp(G0 * z_m / (R_D * T_bar))
-    return float(p0)
-
-# ----------------------------- HDOB encoding helpers -----------------------------
-def lat_to_LLLLH(lat: float) -> str:
-    hemi = "N" if lat >= 0 else "S"
-    lat_abs = abs(lat)
-    deg = int(math.floor(lat_abs))
-    minutes = int(round((lat_abs - deg) * 60.0))
-    if minutes == 60:
-        deg += 1
-        minutes = 0
-    return f"{deg:02d}{minutes:02d}{hemi}"
-
-def lon_to_NNNNNH(lon: float) -> str:
-    hemi = "E" if lon >= 0 else "W"
-    lon_abs = abs(lon)
-    deg = int(math.floor(lon_abs))
-    minutes = int(round((lon_abs - deg) * 60.0))
-    if minutes == 60:
-        deg += 1
-        minutes = 0
-    return f"{deg:03d}{minutes:02d}{hemi}"
-
-def encode_PPPP(ps_hpa: Optional[float]) -> str:
-    if ps_hpa is None:
-        return "////"
-    tenths = int(round(ps_hpa * 10.0))
-    if tenths >= 10000:
-        tenths -= 10000
-    return f"{tenths:04d}"
-
-def encode_GGGGG(z_m: Optional[float]) -> str:
-    if z_m is None:
-        return "/////"
-    val = int(round(z_m))
-    return f"{val:05d}"
-
-def encode_XXXX(ps_hpa: Optional[float], z_m: Optional[float], t_c: Optional[float]) -> str:
-    if ps_hpa is None or z_m is None:
-        return "////"
-    if ps_hpa >= 550.0:
-        p0 = extrapolate_surface_pressure(ps_hpa, z_m, t_c)
-        return encode_PPPP(p0)
-    else:
-        d = d_value_m(z_m, ps_hpa)
-        if d is None:
-            return "////"
-        if d < 0:
-            d = 5000 + d
-        return f"{int(round(d))%10000:04d}"
-
-def encode_sxxx(val_c: Optional[float]) -> str:
-    if val_c is None:
-        return "///"
-    sign = "+" if val_c >= 0 else "-"
-    mag = int(round(abs(val_c) * 10.0))
-    return f"{sign}{mag:03d}"
-
-def encode_wwwSSS(wdir_deg: Optional[float], wspd_ms: Optional[float]) -> str:
-    if wdir_deg is None or wspd_ms is None:
-        return "//////"
-    www = int(round(wdir_deg)) % 360
-    sss = int(round(wspd_ms * KTS_PER_MPS))
-    return f"{www:03d}{sss:03d}"
-
-def encode_TTT(val: Optional[int]) -> str:
-    if val is None:
-        return "///"
-    return f"{int(round(val)):03d}"
-
 # ----------------------------- wind mean/peak logic -----------------------------
-def vector_mean_wind(dir_deg_list: List[float], spd_ms_list: List[float]) -> Tuple[Optional[float], Optional[float]]:
-    if not dir_deg_list or not spd_ms_list:
-        return (None, None)
-    u = 0.0; v = 0.0; n = 0
-    for d, s in zip(dir_deg_list, spd_ms_list):
-        if d is None or s is None:
-            continue
-        rad = math.radians(d)
-        u += -s * math.sin(rad)
-        v += -s * math.cos(rad)
-        n += 1
+def bin_vector_mean_wind(bin_idx: np.ndarray, nbins: int, wdir_deg: np.ndarray,
+                         wspd_ms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vector-mean wind (direction deg, speed m/s) for every bin at once.
+    Samples missing either component are skipped; bins with none come back NaN.
+    """
+    ok = ~(np.isnan(wdir_deg) | np.isnan(wspd_ms))
+    idx = bin_idx[ok]
+    rad = np.deg2rad(wdir_deg[ok])
+    spd = wspd_ms[ok]
+    n = np.bincount(idx, minlength=nbins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        u = np.bincount(idx, weights=-spd * np.sin(rad), minlength=nbins) / n
+        v = np.bincount(idx, weights=-spd * np.cos(rad), minlength=nbins) / n
+    deg = (np.degrees(np.arctan2(-u, -v)) + 360.0) % 360.0
+    return deg, np.hypot(u, v)
+
+def bin_peak10s(t_us: np.ndarray, spd_ms: np.ndarray, bin_idx: np.ndarray, nbins: int) -> np.ndarray:
+    """
+    Peak 10 s mean wind (kt) for every bin in one pass over the whole series: the trailing
+    10 s mean at each sample (window clipped to the sample's own bin), then the max per bin.
+    Samples must be time-sorted with no missing speeds; bins with none come back NaN.
+    """
+    peak = np.full(nbins, np.nan)
+    n = len(spd_ms)
     if n == 0:
-        return (None, None)
-    u /= n; v /= n
-    spd = math.hypot(u, v)
-    dir_rad = math.atan2(-u, -v)
-    deg = (math.degrees(dir_rad) + 360.0) % 360.0
-    return (deg, spd)
-
-def compute_peak10s(times: List[dt.datetime], spd_ms_list: List[Optional[float]]) -> Optional[float]:
-    if not times:
-        return None
-    samples = [(t, s) for t, s in zip(times, spd_ms_list) if s is not None]
-    if not samples:
-        return None
-    dq = deque()
-    sum_s = 0.0
-    count = 0
-    best_mean = 0.0
-    for t, s in samples:
-        dq.append((t, s))
-        sum_s += s; count += 1
-        tmin = t - dt.timedelta(seconds=10)
-        while dq and dq[0][0] < tmin:
-            _, s0 = dq.popleft()
-            sum_s -= s0; count -= 1
-        if count > 0:
-            best_mean = max(best_mean, sum_s/count)
-    if best_mean == 0.0:
-        best = max(s for _, s in samples)
-        return best * KTS_PER_MPS
-    return best_mean * KTS_PER_MPS
+        return peak
+    starts = np.flatnonzero(np.r_[True, bin_idx[1:] != bin_idx[:-1]])
+    run = np.cumsum(np.r_[True, bin_idx[1:] != bin_idx[:-1]]) - 1
+    pos = np.arange(n) - starts[run]
+    # window sums from prefix sums local to each bin (bins padded into rows): a single
+    # cumsum over the whole flight carries error that grows with the flight's total and
+    # is enough to flip the rounding of MMM
+    rows = np.zeros((len(starts), int(pos.max()) + 2))
+    rows[run, pos + 1] = spd_ms
+    csum = np.cumsum(rows, axis=1)
+    head = np.maximum(np.searchsorted(t_us, t_us - 10_000_000, side="left"), starts[run]) - starts[run]
+    mean = (csum[run, pos + 1] - csum[run, head]) / (pos + 1 - head)
+    best = np.maximum.reduceat(mean, starts)
+    # no positive window mean (calm bin) -> fall back to the top sample
+    peak[bin_idx[starts]] = np.where(best > 0.0, best, np.maximum.reduceat(spd_ms, starts)) * KTS_PER_MPS
+    return peak
 
 # ----------------------------- time input helper -----------------------------
 def _time_input_to_seconds(s: Optional[str]) -> Optional[int]:
@@ -284,150 +171,294 @@ def _time_input_to_seconds(s: Optional[str]) -> Optional[int]:
     return hh*3600 + mm*60 + ss
 
 # ----------------------------- conversion to HDOB (core) -----------------------------
-def convert_iwg1_to_hdob(rows: List[IWG1Row], mission: str, storm_date: dt.date,
+def _bin_means(bin_idx: np.ndarray, nbins: int, vals: np.ndarray) -> np.ndarray:
+    """Per-bin mean of vals ignoring NaN; NaN for bins with no valid value."""
+    ok = ~np.isnan(vals)
+    counts = np.bincount(bin_idx[ok], minlength=nbins)
+    sums = np.bincount(bin_idx[ok], weights=vals[ok], minlength=nbins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts
+
+def _fmt_column(fmt: str, vals: np.ndarray, missing: str) -> List[str]:
+    """%-format a column of whole-number floats, with the slash group where NaN."""
+    ok = ~np.isnan(vals)
+    ints = np.where(ok, vals, 0).astype(np.int64).tolist()
+    return [fmt % v if k else missing for v, k in zip(ints, ok.tolist())]
+
+def _fmt_signed_tenths(vals_c: np.ndarray) -> List[str]:
+    """sTTT/sddd groups: sign + tenths of a degree, "///" where NaN."""
+    signs = np.where(vals_c >= 0, "+", "-").tolist()
+    mags = _fmt_column("%03d", np.rint(np.abs(vals_c) * 10.0), "")
+    return [sign + mag if mag else "///" for sign, mag in zip(signs, mags)]
+
+def _fmt_coord_column(vals: np.ndarray, fmt: str, pos: str, neg: str, missing: str) -> List[str]:
+    """LLLLH/NNNNNH groups: degrees*100 + whole minutes, then hemisphere."""
+    a = np.abs(vals)
+    deg = np.floor(a)
+    minutes = np.rint((a - deg) * 60.0)
+    carry = minutes == 60.0  # 59.5+ minutes rounds up into the next degree
+    packed = (deg + carry) * 100.0 + minutes - 60.0 * carry
+    hemi = np.where(vals >= 0, pos, neg).tolist()
+    return [d + h if d else missing for d, h in zip(_fmt_column(fmt, packed, ""), hemi)]
+
+def _fmt_xxxx_column(ps_hpa: np.ndarray, z_m: np.ndarray, t_c: np.ndarray) -> List[str]:
+    """
+    XXXX group: extrapolated surface pressure at/below 550 hPa flight levels
+    (ps >= 550), D-value above. Physics is evaluated for all bins in one go.
+    """
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        z_std = np.maximum(0.0, (T0_STD / LAPSE) * (1.0 - np.power(ps_hpa / P0_STD, (R_D * LAPSE) / G0)))
+        # surface pressure branch: hydrostatic extrapolation over the layer mean temperature
+        T_z = np.where(np.isnan(t_c), T0_STD - LAPSE * z_std, t_c + 273.15)
+        T_bar = T_z + 0.5 * LAPSE * z_m
+        p0 = np.where(T_bar > 0, ps_hpa * np.exp(G0 * z_m / (R_D * T_bar)), np.nan)
+        p0_tenths = np.rint(p0 * 10.0)
+        p0_tenths -= 10000.0 * (p0_tenths >= 10000)
+        # D-value branch: GPS altitude minus ISA pressure altitude
+        d = np.rint(z_m - z_std)
+        d = np.where(d < 0, 5000.0 + d, d) % 10000
+        vals = np.where(ps_hpa >= 550.0, p0_tenths, d)
+    return _fmt_column("%04d", vals, "////")
+
+def convert_iwg1_to_hdob(t_us: np.ndarray, vals: np.ndarray, mission: str, storm_date: dt.date,
                          interval_s: int = 30, lines_per_msg: int = 20,
                          header_center: str = "KNHC", wmo_header: str = "URNT15",
                          default_flags: str = "00") -> str:
-    if not rows:
+    """t_us/vals are the parsed IWG1 columns as read_iwg1 returns them (see _parse_slab)."""
+    if not len(t_us):
         return ""
-    rows = sorted(rows, key=lambda r: r.t)
-    start = rows[0].t
-    out_lines: List[str] = []
-
-    # align first bin to multiple of interval_s
-    bin_start = dt.datetime.fromtimestamp((start.timestamp() // interval_s) * interval_s, tz=dt.timezone.utc)
-    i = 0
-    while i < len(rows):
-        cur_bin_end = bin_start + dt.timedelta(seconds=interval_s)
-        bin_rows: List[IWG1Row] = []
-        while i < len(rows) and rows[i].t < cur_bin_end:
-            bin_rows.append(rows[i])
-            i += 1
-
-        if bin_rows:
-            mid_time = bin_start + dt.timedelta(seconds=interval_s // 2)
-            lat_vals = [r.lat for r in bin_rows if r.lat is not None]
-            lon_vals = [r.lon for r in bin_rows if r.lon is not None]
-            lat = sum(lat_vals)/len(lat_vals) if lat_vals else None
-            lon = sum(lon_vals)/len(lon_vals) if lon_vals else None
-
-            ps_vals = [r.ps_hpa for r in bin_rows if r.ps_hpa is not None]
-            ps = sum(ps_vals)/len(ps_vals) if ps_vals else None
-
-            ga_vals = [r.ga_m for r in bin_rows if r.ga_m is not None]
-            ga = sum(ga_vals)/len(ga_vals) if ga_vals else None
-
-            t_vals = [r.temp_c for r in bin_rows if r.temp_c is not None]
-            t_c = sum(t_vals)/len(t_vals) if t_vals else None
-
-            td_vals = [r.td_c for r in bin_rows if r.td_c is not None]
-            td_c = sum(td_vals)/len(td_vals) if td_vals else None
-
-            d_list = [r.wdir_deg for r in bin_rows if r.wdir_deg is not None and r.wspd_ms is not None]
-            s_list = [r.wspd_ms for r in bin_rows if r.wdir_deg is not None and r.wspd_ms is not None]
-            mean_dir, mean_spd = vector_mean_wind(d_list, s_list)
-
-            times = [r.t for r in bin_rows]
-            spds = [r.wspd_ms for r in bin_rows]
-            peak10 = compute_peak10s(times, spds)
-
-            hhmmss = mid_time.strftime("%H%M%S")
-            lat_str = lat_to_LLLLH(lat) if lat is not None else "/////"
-            lon_str = lon_to_NNNNNH(lon) if lon is not None else "//////"
-            pppp = encode_PPPP(ps)
-            ggggg = encode_GGGGG(ga)
-            xxxx = encode_XXXX(ps, ga, t_c)
-            sTTT = encode_sxxx(t_c)
-            sddd = encode_sxxx(td_c)
-            wwwSSS = encode_wwwSSS(mean_dir, mean_spd)
-
-            if peak10 is None or (isinstance(peak10, float) and math.isnan(peak10)):
-                MMM = "///"
-            else:
-                try:
-                    MMM = encode_TTT(int(round(float(peak10))))
-                except Exception:
-                    MMM = "///"
-
-            KKK = "///"
-            ppp = "///"
-            FF = default_flags
-
-            line = f"{hhmmss} {lat_str} {lon_str} {pppp} {ggggg} {xxxx} {sTTT} {sddd} {wwwSSS} {MMM} {KKK} {ppp} {FF}"
-            out_lines.append(line)
-
-        bin_start = cur_bin_end
-        if i < len(rows) and rows[i].t >= bin_start + dt.timedelta(seconds=interval_s):
-            next_ts = rows[i].t
-            bin_start = dt.datetime.fromtimestamp((next_ts.timestamp() // interval_s) * interval_s, tz=dt.timezone.utc)
-
-    msgs: List[str] = []
-    ddhhmm = (start + dt.timedelta(seconds=interval_s // 2)).strftime("%d%H%M") if out_lines else dt.datetime.now(dt.timezone.utc).strftime("%d%H%M")
-    for obnum, i in enumerate(range(0, len(out_lines), lines_per_msg), start=1):
-        lines = out_lines[i:i + lines_per_msg]
-        header = f"{wmo_header} {header_center} {ddhhmm}"
-        mission_line = f"{mission} HDOB {obnum:02d} {storm_date.strftime('%Y%m%d')}"
-        msg = "\n".join([header, mission_line] + lines + ["$$"])
-        msgs.append(msg)
-    return "\n\n".join(msgs) + ("\n" if msgs else "")
-
-# ----------------------------- I/O and multithreaded parsing -----------------------------
-def read_iwg1(path: Optional[str], url: Optional[str], workers: int = 4) -> List[IWG1Row]:
+    # IWG1 streams are time-ordered in practice: only sort when they aren't
+    if np.any(np.diff(t_us) < 0):
+        order = np.argsort(t_us, kind="stable")
+        t_us, vals = t_us[order], vals[order]
+
+    lat_a, lon_a, gps_msl_a, wgs84_a, t_a, td_a, ps_a, wspd_a, wdir_a = vals.T
+    ga_a = np.where(np.isnan(gps_msl_a), wgs84_a, gps_msl_a)  # GPS MSL altitude, else WGS-84
+
+    # bins are aligned to multiples of interval_s since the epoch; only occupied bins are emitted
+    # (samples are sorted, so each bin is one contiguous run: find the run starts in O(N))
+    interval_us = interval_s * 1_000_000
+    sample_bin = t_us // interval_us
+    is_start = np.empty(len(sample_bin), dtype=bool)
+    is_start[0] = True
+    np.not_equal(sample_bin[1:], sample_bin[:-1], out=is_start[1:])
+    starts = np.flatnonzero(is_start)
+    bin_no = sample_bin[starts]
+    bin_idx = np.cumsum(is_start) - 1
+    nbins = len(starts)
+    lat_m, lon_m, ps_m, ga_m, t_m, td_m = (_bin_means(bin_idx, nbins, a) for a in (lat_a, lon_a, ps_a, ga_a, t_a, td_a))
+    wdir_m, wspd_m = bin_vector_mean_wind(bin_idx, nbins, wdir_a, wspd_a)
+    half_us = (interval_s // 2) * 1_000_000
+
+    # observation time = bin midpoint, as seconds of the UTC day
+    mid_sod = ((bin_no * interval_us + half_us) // 1_000_000) % 86400
+    hhmmss = ["%02d%02d%02d" % hms for hms in zip((mid_sod // 3600).tolist(), (mid_sod // 60 % 60).tolist(),
+                                                   (mid_sod % 60).tolist())]
+
+    # peak wind over the samples that have a speed
+    has_spd = ~np.isnan(wspd_a)
+    peak_m = bin_peak10s(t_us[has_spd], wspd_a[has_spd], bin_idx[has_spd], nbins)
+
+    # remaining groups are plain scaled integers: encode them column-wise
+    lat_s = _fmt_coord_column(lat_m, "%04d", "N", "S", "/////")
+    lon_s = _fmt_coord_column(lon_m, "%05d", "E", "W", "//////")
+    tenths = np.rint(ps_m * 10.0)
+    pppp = _fmt_column("%04d", tenths - 10000.0 * (tenths >= 10000), "////")
+    ggggg = _fmt_column("%05d", np.rint(ga_m), "/////")
+    xxxx = _fmt_xxxx_column(ps_m, ga_m, t_m)
+    sTTT = _fmt_signed_tenths(t_m)
+    sddd = _fmt_signed_tenths(td_m)
+    wind_ok = ~(np.isnan(wdir_m) | np.isnan(wspd_m))
+    www = np.where(wind_ok, np.rint(wdir_m), 0).astype(np.int64) % 360
+    sss = np.where(wind_ok, np.rint(wspd_m * KTS_PER_MPS), 0).astype(np.int64)
+    wwwSSS = ["%03d%03d" % ws if ok else "//////" for ws, ok in zip(zip(www.tolist(), sss.tolist()), wind_ok.tolist())]
+    MMM = _fmt_column("%03d", np.rint(peak_m), "///")
+
+    # KKK (SFMR peak) and ppp (rain rate) are not available from IWG1
+    line_fmt = "{} {} {} {} {} {} {} {} {} {} /// /// {}".format
+    out_lines = [line_fmt(*f, default_flags) for f in zip(hhmmss, lat_s, lon_s, pppp, ggggg, xxxx, sTTT, sddd, wwwSSS, MMM)]
+
+    # messages are written straight into one buffer; each ends "$$" plus a blank separator line
+    buf = io.StringIO()
+    write = buf.write
+    ddhhmm = (_EPOCH + dt.timedelta(microseconds=int(t_us[0]) + half_us)).strftime("%d%H%M")
+    header = f"{wmo_header} {header_center} {ddhhmm}\n"
+    date_s = storm_date.strftime('%Y%m%d')
+    lines_it = iter(out_lines)
+    for obnum in range(1, -(-len(out_lines) // lines_per_msg) + 1):
+        write(header)
+        write(f"{mission} HDOB {obnum:02d} {date_s}\n")
+        for line in itertools.islice(lines_it, lines_per_msg):
+            write(line)
+            write("\n")
+        write("$$\n\n")
+    # drop the separator after the last message
+    return buf.getvalue()[:-1]
+
+# ----------------------------- I/O and multiprocess parsing -----------------------------
+# Inputs smaller than this (in bytes) are parsed serially; below it the
+# cost of starting worker processes outweighs the parse itself.
+PARALLEL_MIN_BYTES = 1 << 20
+
+# IWG1 records in raw file bytes (leading blanks allowed, as with str.strip())
+_IWG1_LINE_RE = re.compile(rb"^[ \t]*IWG1,[^\r\n]*", re.MULTILINE)
+
+def _file_iwg1_lines(path: str) -> Tuple[List[bytes], int]:
     """
-    Read IWG1 rows from path or URL and parse into IWG1Row objects using a thread pool.
-    workers: number of threads to use (>=1). If 1 -> single-threaded.
+    Memory-map a local file and pull out only its IWG1 lines (as bytes) in one scan.
+    Returns (lines, file size in bytes).
     """
-    if path:
-        with open(path, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
-    elif url:
-        if requests is None:
-            raise RuntimeError("'requests' is required to read from URL; install it or use --path.")
-        resp = requests.get(url, timeout=60)
-        resp.raise_for_status()
-        text = resp.text
-    else:
-        raise ValueError("Provide --path or --url")
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return [], 0  # mmap refuses empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _IWG1_LINE_RE.findall(mm), size
+
+# IWG1 field indices read by the converter (after the timestamp): lat, lon,
+# GPS MSL alt, WGS-84 alt, ambient temp, dew point, static press, wind speed, wind dir
+_VALUE_COLS = (2, 3, 4, 5, 20, 21, 23, 26, 27)
+
+def _parse_floats(raw: np.ndarray) -> np.ndarray:
+    """Convert an array of numeric strings to float64 in one pass (NaN = missing)."""
+    try:
+        vals = np.where(np.char.strip(raw) == "", "nan", raw).astype(np.float64)
+    except ValueError:
+        # at least one malformed token: fall back to the per-field parser
+        vals = np.array([parse_float(x) for x in raw.ravel()], dtype=np.float64).reshape(raw.shape)
+    vals[~np.isfinite(vals)] = np.nan
+    return vals
+
+def _parse_times_us(raw: List[str]) -> np.ndarray:
+    """Convert timestamp strings to int64 epoch microseconds (_NAT where unparseable)."""
+    try:
+        with warnings.catch_warnings():
+            # numpy only warns on zone-suffixed stamps; send those through parse_time
+            warnings.simplefilter("error")
+            return np.array(raw, dtype="datetime64[us]").astype(np.int64)
+    except (ValueError, UserWarning, DeprecationWarning):
+        pass
+    out = np.empty(len(raw), dtype=np.int64)
+    for i, s in enumerate(raw):
+        try:
+            out[i] = (parse_time(s) - _EPOCH) // _US
+        except ValueError:
+            out[i] = _NAT
+    return out
 
-    parts_list = []
+def _parse_slab(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Worker entrypoint: parse one slab of IWG1 text into (t_us, vals) arrays,
+    where vals has one column per _VALUE_COLS entry. Rows with a bad timestamp are dropped.
+    """
+    times = []
+    raw = []
     for parts in iwg1_iter_lines_from_text(text):
-        parts_list.append(parts)
-
-    if not parts_list:
-        return []
+        n = len(parts)
+        times.append(parts[1])
+        raw.append([parts[i] if i < n else "" for i in _VALUE_COLS])
+    if not times:
+        return np.empty(0, dtype=np.int64), np.empty((0, len(_VALUE_COLS)))
+    t_us = _parse_times_us(times)
+    vals = _parse_floats(np.array(raw, dtype=str))
+    ok = t_us != _NAT
+    return t_us[ok], vals[ok]
+
+def _url_slabs(resp, slab_bytes: int = 1 << 20) -> Iterator[str]:
+    """Group a streamed HTTP response's IWG1 lines into slabs of about slab_bytes as they arrive."""
+    while True:
+        batch = resp.readlines(slab_bytes)
+        if not batch:
+            return
+        yield b"\n".join(_IWG1_LINE_RE.findall(b"".join(batch))).decode("utf-8", errors="ignore")
+
+@functools.lru_cache(maxsize=None)
+def _process_pool(n: int) -> concurrent.futures.ProcessPoolExecutor:
+    """
+    Parse pool shared by every read_iwg1 call in this process, created on first use,
+    so repeated conversions don't pay worker start-up/teardown each time.
+    """
+    pool = concurrent.futures.ProcessPoolExecutor(max_workers=n)
+    atexit.register(pool.shutdown)
+    return pool
 
-    # If workers == 1, do simple serial parse (avoid thread overhead)
-    if workers is None or workers <= 1:
-        rows = [parse_iwg1_row(p) for p in parts_list]
+def _parse_slabs(slabs: Iterable[str], n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse slabs in order, handing each to one of n worker processes as soon as
+    it is available (so a streamed download overlaps with parsing).
+    """
+    ex = None
+    if n > 1:
+        try:
+            ex = _process_pool(n)
+        except Exception:
+            # worker processes unavailable (sandboxed/frozen interpreter) -> serial parse
+            ex = None
+    if ex is None:
+        results = [_parse_slab(slab) for slab in slabs]
     else:
-        # cap workers to reasonable number
-        max_workers = max(1, min(workers, (os.cpu_count() or 4) * 4))
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
-            rows = list(ex.map(parse_iwg1_row, parts_list))
-    # filter Nones
-    rows = [r for r in rows if r is not None]
-    return rows
+        # workers only start on submit, so a failure to spawn them (or a worker dying)
+        # surfaces here: drop the pool and parse the slabs in this process instead
+        slabs = iter(slabs)
+        seen = []
+        try:
+            futures = []
+            for slab in slabs:
+                seen.append(slab)
+                futures.append(ex.submit(_parse_slab, slab))
+            results = [f.result() for f in futures]
+        except (concurrent.futures.process.BrokenProcessPool, OSError):
+            _process_pool.cache_clear()  # never hand a dead pool out again
+            ex.shutdown(wait=False, cancel_futures=True)
+            results = [_parse_slab(slab) for slab in itertools.chain(seen, slabs)]
+    if not results:
+        return _parse_slab("")
+    return np.concatenate([r[0] for r in results]), np.concatenate([r[1] for r in results])
+
+def read_iwg1(path: Optional[str], url: Optional[str], workers: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read IWG1 from path or URL into (t_us, vals) columns (see _parse_slab).
+    workers: number of processes to use (>=1). If 1, or the input is small -> single-process.
+    URLs are streamed and parsed slab by slab while the download continues.
+    """
+    # Parsing is CPU-bound pure Python (holds the GIL), so threads don't help;
+    # split large inputs into slabs for worker processes instead.
+    n = max(1, min(workers or 1, os.cpu_count() or 1))
+    if path:
+        lines, size = _file_iwg1_lines(path)
+        if size < PARALLEL_MIN_BYTES:
+            n = 1
+        # one slab per worker; only the kept IWG1 lines are ever decoded
+        step = max(1, -(-len(lines) // n))
+        slabs = (b"\n".join(lines[i:i + step]).decode("utf-8", errors="ignore")
+                 for i in range(0, len(lines), step))
+        return _parse_slabs(slabs, n)
+    elif url:
+        # HTTP errors raise urllib.error.HTTPError
+        with urllib.request.urlopen(url, timeout=60) as resp:
+            size = int(resp.headers.get("Content-Length") or 0)
+            if size and size < PARALLEL_MIN_BYTES:
+                n = 1
+            return _parse_slabs(_url_slabs(resp), n)
+    else:
+        raise ValueError("Provide --path or --url")
 
 # ----------------------------- filtering by time of day -----------------------------
-def _filter_rows_by_time_of_day(rows: List[IWG1Row], start_sec: Optional[int], end_sec: Optional[int]) -> List[IWG1Row]:
-    if start_sec is None and end_sec is None:
-        return rows
-    out = []
-    for r in rows:
-        t = r.t.astimezone(dt.timezone.utc)
-        sec = t.hour * 3600 + t.minute * 60 + t.second
-        if start_sec is not None and end_sec is not None:
-            if start_sec <= end_sec:
-                keep = (start_sec <= sec <= end_sec)
-            else:
-                keep = (sec >= start_sec or sec <= end_sec)
-        elif start_sec is not None:
-            keep = (sec >= start_sec)
-        else:
-            keep = (sec <= end_sec)
-        if keep:
-            out.append(r)
-    return out
+def _time_of_day_mask(t_us: np.ndarray, start_sec: Optional[int], end_sec: Optional[int]) -> np.ndarray:
+    """
+    Boolean mask of samples whose UTC time of day lies in [start_sec, end_sec]
+    (either bound optional; start > end wraps past midnight).
+    """
+    sec = (t_us // 1_000_000) % 86400
+    if start_sec is not None and end_sec is not None:
+        if start_sec <= end_sec:
+            return (sec >= start_sec) & (sec <= end_sec)
+        return (sec >= start_sec) | (sec <= end_sec)
+    if start_sec is not None:
+        return sec >= start_sec
+    if end_sec is not None:
+        return sec <= end_sec
+    return np.ones(len(t_us), dtype=bool)
 
 def auto_mission_from_tail(url_or_path: str, fallback: str = "AFXXX 0000A INVEST") -> str:
     tail = url_or_path.split("/")[-1]
@@ -440,7 +471,7 @@ def auto_mission_from_tail(url_or_path: str, fallback: str = "AFXXX 0000A INVEST
 
 # ----------------------------- CLI entrypoint -----------------------------
 def main(argv: Optional[List[str]] = None) -> int:
-    ap = argparse.ArgumentParser(description="Convert IWG1 to HDOB (supports time-window filtering and multithreaded parsing).")
+    ap = argparse.ArgumentParser(description="Convert IWG1 to HDOB (supports time-window filtering and multiprocess parsing).")
     src = ap.add_mutually_exclusive_group(required=True)
     src.add_argument("--path", help="Path to local IWG1 file")
     src.add_argument("--url", help="URL to IWG1 file")
@@ -451,11 +482,11 @@ def main(argv: Optional[List[str]] = None) -> int:
     ap.add_argument("--out", help="Output file path for HDOB text; default prints to stdout")
     ap.add_argument("--start", help="UTC start time-of-day (HH:MM or HHMM or HH:MM:SS or HHMMSS)", default=None)
     ap.add_argument("--end", help="UTC end time-of-day (HH:MM or HHMM or HH:MM:SS or HHMMSS)", default=None)
-    ap.add_argument("--workers", type=int, default=4, help="Number of worker threads for parsing (default: 4)")
+    ap.add_argument("--workers", type=int, default=4, help="Number of worker processes for parsing large inputs (default: 4)")
     args = ap.parse_args(argv)
 
-    rows = read_iwg1(args.path, args.url, workers=args.workers)
-    if not rows:
+    t_us, vals = read_iwg1(args.path, args.url, workers=args.workers)
+    if not len(t_us):
         print("No IWG1 rows parsed.", file=sys.stderr)
         return 2
 
@@ -471,21 +502,20 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"Invalid --end value: {e}", file=sys.stderr)
         return 5
 
-    print(f"Read {len(rows)} rows from source (after parsing).")
+    print(f"Read {len(t_us)} rows from source (after parsing).")
     if start_sec is not None or end_sec is not None:
-        rows_filtered = _filter_rows_by_time_of_day(rows, start_sec, end_sec)
-        print(f"{len(rows_filtered)} rows remain after applying time window (start={args.start}, end={args.end}).")
-        rows = rows_filtered
-        if not rows:
+        keep = _time_of_day_mask(t_us, start_sec, end_sec)
+        t_us, vals = t_us[keep], vals[keep]
+        print(f"{len(t_us)} rows remain after applying time window (start={args.start}, end={args.end}).")
+        if not len(t_us):
             print("No rows after filtering -- no HDOB will be produced.", file=sys.stderr)
-
-    first_date = rows[0].t.date() if rows else dt.datetime.utcnow().date()
+    first_date = (_EPOCH + dt.timedelta(microseconds=int(t_us[0]))).date() if len(t_us) else dt.datetime.utcnow().date()
     storm_date = dt.datetime.strptime(args.storm_date, "%Y%m%d").date() if args.storm_date else first_date
 
     src_label = args.url or args.path or ""
     mission = args.mission or auto_mission_from_tail(src_label)
 
-    text = convert_iwg1_to_hdob(rows, mission=mission, storm_date=storm_date,
+    text = convert_iwg1_to_hdob(t_us, vals, mission=mission, storm_date=storm_date,
                                 interval_s=args.interval, lines_per_msg=args.lines_per_message)
     if not text:
         print("No HDOB output generated.", file=sys.stderr)
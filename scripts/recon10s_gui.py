@@ -2,8 +2,9 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter import filedialog, messagebox, scrolledtext, ttk
 import datetime as dt
+import functools
+import mmap
 import os
-import re
 import threading
 import queue
 import json
@@ -14,6 +15,8 @@ import zipfile
 import webbrowser
 from typing import Optional, List, Tuple, Dict, Any
 
+import numpy as np
+
 # HTTP helper libs (optional requests)
 try:
     import requests
@@ -23,8 +26,8 @@ import urllib.request
 import urllib.error
 
 # local project modules (expected to exist in same folder)
+import hdob_records
 import recon10s
-import recon10s_plot
 
 # SETTINGS file path (next to this script)
 SETTINGS_FILE = os.path.join(os.path.dirname(__file__), "recon10s_settings.json")
@@ -33,29 +36,48 @@ VERSION_FILE = os.path.join(os.path.dirname(__file__), "VERSION")
 # -------------------------
 # Simple validators
 # -------------------------
-_time_colon_re = re.compile(r"^\s*(\d{1,2}):(\d{2})(?::(\d{2}))?\s*$")
-_time_plain_re = re.compile(r"^\s*(\d{4}|\d{6})\s*$")
+_ASCII_DIGITS = b"0123456789"
 
 
+def _split_time(s2: str) -> Optional[Tuple[int, int, int]]:
+    """(hh, mm, ss) from a stripped H:MM, HH:MM[:SS], HHMM or HHMMSS string; None if malformed."""
+    hh, sep, rest = s2.partition(":")
+    if not sep:
+        # HHMM / HHMMSS, the common case: plain slicing, no byte translate
+        if len(s2) in (4, 6) and s2.isascii() and s2.isdigit():
+            return int(s2[:2]), int(s2[2:4]), int(s2[4:6] or 0)
+        return None
+    mm, sep, ss = rest.partition(":")
+    if not (1 <= len(hh) <= 2 and len(mm) == 2 and (not sep or len(ss) == 2)):
+        return None
+    ss = ss or "00"
+    # six ASCII digits HHMMSS; anything else survives the delete-digits translate
+    b = (hh.zfill(2) + mm + ss).encode("ascii", "replace")
+    if b.translate(None, _ASCII_DIGITS):
+        return None
+    return (b[0] - 48) * 10 + b[1] - 48, (b[2] - 48) * 10 + b[3] - 48, (b[4] - 48) * 10 + b[5] - 48
+
+
+@functools.lru_cache(maxsize=256)
 def validate_time_string(s: str) -> bool:
-    if s is None:
-        return True
-    s2 = s.strip()
-    if s2 == "":
-        return True
-    m = _time_colon_re.match(s2)
-    if m:
-        hh = int(m.group(1)); mm = int(m.group(2)); ss = int(m.group(3)) if m.group(3) else 0
-        return 0 <= hh < 24 and 0 <= mm < 60 and 0 <= ss < 60
-    m2 = _time_plain_re.match(s2)
-    if m2:
-        token = m2.group(1)
-        if len(token) == 4:
-            hh = int(token[:2]); mm = int(token[2:4]); ss = 0
-        else:
-            hh = int(token[:2]); mm = int(token[2:4]); ss = int(token[4:6])
-        return 0 <= hh < 24 and 0 <= mm < 60 and 0 <= ss < 60
-    return False
+    if not s or s.isspace():
+        return True  # None or blank: no bound set
+    hms = _split_time(s.strip())
+    if hms is None:
+        return False
+    hh, mm, ss = hms  # digits only, never negative
+    return hh < 24 and mm < 60 and ss < 60
+
+
+_TIME_ENTRY_CHARS = frozenset("0123456789: \t")
+
+
+def _tk_validate_time(proposed: str) -> bool:
+    """
+    validatecommand (%P) of the time entries: refuse an edit that leaves characters no
+    time can contain. Partial input ("12:", "123") is allowed; validate_time_string judges the result.
+    """
+    return _TIME_ENTRY_CHARS.issuperset(proposed)
 
 
 # -------------------------
@@ -72,6 +94,9 @@ settings = DEFAULTS.copy()
 
 # worker queue used by background thread
 worker_queue: "queue.Queue[dict]" = queue.Queue()
+# conversion jobs, run one at a time by a single long-lived thread (see _submit_conversion)
+job_queue: "queue.Queue[tuple]" = queue.Queue()
+_conversion_thread: Optional[threading.Thread] = None
 
 # -------------------------
 # ToolTip helper
@@ -105,30 +130,36 @@ class ToolTip:
 # -------------------------
 # Settings persistence
 # -------------------------
+def _write_settings(obj: dict, mode: str = "w", indent: Optional[int] = None):
+    """Write obj as the settings file: compact JSON unless indent is given. Errors propagate."""
+    with open(SETTINGS_FILE, mode, encoding="utf-8") as fh:
+        json.dump(obj, fh, indent=indent, separators=None if indent else (",", ":"))
+
+
+def _write_defaults():
+    """Write the default settings file (best effort), so it exists and users can open it."""
+    try:
+        _write_settings(DEFAULTS)
+    except Exception:
+        pass
+
+
 def load_settings():
     global settings
-    if os.path.exists(SETTINGS_FILE):
-        try:
-            with open(SETTINGS_FILE, "r", encoding="utf-8") as fh:
-                obj = json.load(fh)
-            for k in DEFAULTS:
-                if k in obj:
-                    settings[k] = obj[k]
-        except Exception:
-            print("Warning: could not read settings file; using defaults")
-    else:
-        # write defaults so file exists and users can open it
-        try:
-            with open(SETTINGS_FILE, "w", encoding="utf-8") as fh:
-                json.dump(settings, fh, indent=2)
-        except Exception:
-            pass
+    try:
+        with open(SETTINGS_FILE, "r", encoding="utf-8") as fh:
+            obj = json.load(fh)
+        # known keys only; anything missing keeps its default
+        settings = {k: obj.get(k, v) for k, v in DEFAULTS.items()}
+    except FileNotFoundError:
+        _write_defaults()
+    except Exception:
+        print("Warning: could not read settings file; using defaults")
 
 
 def save_settings_to_file():
     try:
-        with open(SETTINGS_FILE, "w", encoding="utf-8") as fh:
-            json.dump(settings, fh, indent=2)
+        _write_settings(settings)
     except Exception as exc:
         raise RuntimeError(f"Failed to write settings file: {exc}")
 
@@ -136,18 +167,12 @@ def save_settings_to_file():
 def reset_settings_file():
     """Reset on-disk settings and in-memory settings to defaults."""
     try:
-        if os.path.exists(SETTINGS_FILE):
-            os.remove(SETTINGS_FILE)
+        os.remove(SETTINGS_FILE)
     except Exception:
         pass
-    # restore in-memory defaults and write defaults file
     global settings
     settings = DEFAULTS.copy()
-    try:
-        with open(SETTINGS_FILE, "w", encoding="utf-8") as fh:
-            json.dump(settings, fh, indent=2)
-    except Exception:
-        pass
+    _write_defaults()
 
 
 # -------------------------
@@ -164,14 +189,14 @@ def restart_program():
 # -------------------------
 def open_settings_file_in_editor():
     """Open the settings JSON using the platform's default app."""
-    if not os.path.exists(SETTINGS_FILE):
-        # try to create it with defaults
-        try:
-            with open(SETTINGS_FILE, "w", encoding="utf-8") as fh:
-                json.dump(settings, fh, indent=2)
-        except Exception as exc:
-            messagebox.showerror("Open failed", f"Could not create settings file: {exc}")
-            return
+    # create it if missing ("x" fails on an existing file); indented, as it is about to be read
+    try:
+        _write_settings(settings, "x", indent=2)
+    except FileExistsError:
+        pass
+    except Exception as exc:
+        messagebox.showerror("Open failed", f"Could not create settings file: {exc}")
+        return
     try:
         if sys.platform.startswith("win"):
             os.startfile(SETTINGS_FILE)
@@ -198,6 +223,43 @@ def choose_output_file():
         out_var.set(out)
 
 
+# Plots run recon10s_plot.py in a child interpreter: matplotlib's show() blocks until its
+# window closes, and must not hold up the Tk main loop. Children are ended on exit.
+PLOT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recon10s_plot.py")
+PLOT_POLL_MS = 500
+_plot_procs: List[subprocess.Popen] = []
+
+
+def launch_plot(hdob_file: str, start_utc: Optional[str] = None, end_utc: Optional[str] = None,
+                show_legend: bool = False, coord_format: str = "decimal", plot_theme: str = "dark"):
+    argv = [sys.executable, PLOT_SCRIPT, hdob_file, "--coord-format", coord_format, "--plot-theme", plot_theme]
+    if start_utc:
+        argv += ["--start", start_utc]
+    if end_utc:
+        argv += ["--end", end_utc]
+    if show_legend:
+        argv.append("--legend")
+    _plot_procs[:] = [p for p in _plot_procs if p.poll() is None]
+    proc = subprocess.Popen(argv, stderr=subprocess.PIPE)
+    _plot_procs.append(proc)
+    # stderr is drained on a helper thread so a chatty child never blocks on a full pipe
+    err_chunks: List[bytes] = []
+    reader = threading.Thread(target=lambda: err_chunks.append(proc.stderr.read()), daemon=True)
+    reader.start()
+    root.after(PLOT_POLL_MS, _check_plot_proc, proc, reader, err_chunks)
+
+
+def _check_plot_proc(proc: subprocess.Popen, reader: threading.Thread, err_chunks: List[bytes]):
+    """Poll a plot child from the Tk loop; a non-zero exit is reported with the tail of its stderr."""
+    if proc.poll() is None or reader.is_alive():
+        root.after(PLOT_POLL_MS, _check_plot_proc, proc, reader, err_chunks)
+        return
+    if proc.returncode != 0:
+        err = b"".join(err_chunks).decode("utf-8", errors="replace").strip()
+        messagebox.showerror("Plot error", f"Plot exited with code {proc.returncode}"
+                             + (f"\n\n{err[-2000:]}" if err else ""))
+
+
 def choose_hdob_and_plot():
     hdob = filedialog.askopenfilename(title="Select HDOB file to plot", filetypes=[("Text files","*.txt"),("All files","*.*")])
     if not hdob:
@@ -211,20 +273,23 @@ def choose_hdob_and_plot():
         parsed, filtered = compute_counts(hdob, start, end)
         status_var.set(f"Parsed {parsed} records — {filtered} records in window")
         if plot_var.get():
-            recon10s_plot.main(hdob, start_utc=start, end_utc=end, show_legend=show_legend,
-                               coord_format=coord_format, plot_theme=plot_theme, show_plot=True)
+            launch_plot(hdob, start_utc=start, end_utc=end, show_legend=show_legend,
+                        coord_format=coord_format, plot_theme=plot_theme)
     except Exception as exc:
         messagebox.showerror("Plot error", f"Plot failed:\n{exc}")
 
 
 # -------------------------
-# Robust time helper & compute_counts (uses recon10s or recon10s_plot helpers if present)
+# Robust time helper & compute_counts (uses the recon10s time helper)
 # -------------------------
+_TIME_TO_SEC = recon10s._time_input_to_seconds
+
+
+@functools.lru_cache(maxsize=64)
 def _time_to_seconds_fallback(time_str: Optional[str]) -> Optional[int]:
     """
     Convert user time input (HH:MM, H:MM, HHMM, HHMMSS) to seconds-since-midnight.
-    Try recon10s._time_input_to_seconds, then recon10s_plot._time_input_to_seconds/_hhmm_to_seconds.
-    Otherwise local parse. Return None for empty input.
+    Try the project helper (_TIME_TO_SEC), otherwise local parse. Return None for empty input.
     """
     if time_str is None:
         return None
@@ -232,49 +297,67 @@ def _time_to_seconds_fallback(time_str: Optional[str]) -> Optional[int]:
     if s == "":
         return None
 
-    # candidate helper functions
-    candidates = [
-        getattr(recon10s, "_time_input_to_seconds", None),
-        getattr(recon10s_plot, "_time_input_to_seconds", None),
-        getattr(recon10s_plot, "_hhmm_to_seconds", None),
-        getattr(recon10s_plot, "_hhmm_to_seconds", None),
-    ]
-    for fn in candidates:
-        if callable(fn):
-            try:
-                return fn(s)
-            except Exception:
-                # helper exists but failed; fall back to local parse
-                break
+    if _TIME_TO_SEC is not None:
+        try:
+            return _TIME_TO_SEC(s)
+        except Exception:
+            # helper exists but failed; fall back to local parse
+            pass
 
     # local parse
-    m = _time_colon_re.match(s)
-    if m:
-        hh = int(m.group(1)); mm = int(m.group(2)); ss = int(m.group(3)) if m.group(3) else 0
-        if 0 <= hh < 24 and 0 <= mm < 60 and 0 <= ss < 60:
-            return hh * 3600 + mm * 60 + ss
-        raise ValueError(f"Time out of range: {s}")
-    m2 = _time_plain_re.match(s)
-    if m2:
-        token = m2.group(1)
-        if len(token) == 4:
-            hh = int(token[:2]); mm = int(token[2:4]); ss = 0
-        else:
-            hh = int(token[:2]); mm = int(token[2:4]); ss = int(token[4:6])
-        if 0 <= hh < 24 and 0 <= mm < 60 and 0 <= ss < 60:
-            return hh * 3600 + mm * 60 + ss
-        raise ValueError(f"Time out of range: {s}")
-    raise ValueError(f"Invalid time string: {s}")
+    hms = _split_time(s)
+    if hms is None:
+        raise ValueError(f"Invalid time string: {s}")
+    hh, mm, ss = hms
+    if 0 <= hh < 24 and 0 <= mm < 60 and 0 <= ss < 60:
+        return hh * 3600 + mm * 60 + ss
+    raise ValueError(f"Time out of range: {s}")
+
+
+# Output files above this size are not loaded as text: the preview shows a tail
+LARGE_HDOB_BYTES = 4 * 1024 * 1024
+
+def _mmap_hdob_hms(hdob_file: str) -> np.ndarray:
+    """(n, 3) hh/mm/ss of every record, read from a memory map of the file without decoding it."""
+    with open(hdob_file, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return np.zeros((0, 3), dtype=np.int32)  # an empty file cannot be mapped
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            found = hdob_records.hdob_record_times(mm)
+    # the two-digit groups as bytes; an absent seconds group is b"" (NUL bytes), i.e. 0
+    b = np.array(found, dtype="S2").reshape(-1, 3).view(np.uint8).reshape(-1, 3, 2).astype(np.int32)
+    d = np.where(b > 0, b - 48, 0)
+    return d[:, :, 0] * 10 + d[:, :, 1]
+
+
+@functools.lru_cache(maxsize=8)
+def _load_secs(hdob_file: str, mtime_ns: int, size: int) -> Tuple[np.ndarray, bool]:
+    """
+    Seconds-of-day of every record in an HDOB file, and whether they are in ascending order.
+    Only the record times are scanned (_mmap_hdob_hms); the full field parse is left to the
+    plot process, so plotting an existing file parses it once rather than twice.
+    Cached per file; mtime_ns/size are only part of the key, so a rewritten file is re-parsed.
+    """
+    hms = _mmap_hdob_hms(hdob_file)
+    secs = hms[:, 0] * 3600 + hms[:, 1] * 60 + hms[:, 2]
+    secs.flags.writeable = False  # shared between callers
+    # time-ordered unless the flight crosses 00Z
+    return secs, bool(np.all(secs[1:] >= secs[:-1]))
 
 
 def compute_counts(hdob_file: str, start_utc: Optional[str], end_utc: Optional[str]) -> tuple:
     """
-    Parse the HDOB file using recon10s_plot.parse_hdob_file and count total + filtered records.
+    Count total + filtered records of an HDOB file (parsed once per file version, see _load_secs).
     Uses _time_to_seconds_fallback for robust parsing.
     Returns (n_total, n_in_window).
     """
-    times, times_tup, lats, lons, mslps, wind_dirs, wind_spds = recon10s_plot.parse_hdob_file(hdob_file)
-    n_total = len(times)
+    if start_utc is None and end_utc is None:
+        # no window: the record count alone will do, no need to parse times
+        n = hdob_records.count_hdob_records(hdob_file)
+        return n, n
+    st = os.stat(hdob_file)
+    secs, ascending = _load_secs(hdob_file, st.st_mtime_ns, st.st_size)
+    n_total = len(secs)
     if n_total == 0:
         return 0, 0
 
@@ -290,60 +373,95 @@ def compute_counts(hdob_file: str, start_utc: Optional[str], end_utc: Optional[s
     if start_sec is None and end_sec is None:
         return n_total, n_total
 
-    count_in = 0
-    for (hh, mm, ss) in times_tup:
-        sec = hh * 3600 + mm * 60 + ss
-        keep = True
-        if start_sec is not None and end_sec is not None:
-            if start_sec <= end_sec:
-                keep = (start_sec <= sec <= end_sec)
-            else:
-                # wrap around midnight
-                keep = (sec >= start_sec or sec <= end_sec)
-        elif start_sec is not None:
-            keep = (sec >= start_sec)
-        elif end_sec is not None:
-            keep = (sec <= end_sec)
-        if keep:
-            count_in += 1
-    return n_total, count_in
+    if ascending:
+        # sorted: the window edges are two binary searches, no pass over the records
+        lo = int(np.searchsorted(secs, start_sec, "left")) if start_sec is not None else 0
+        hi = int(np.searchsorted(secs, end_sec, "right")) if end_sec is not None else n_total
+        if start_sec is not None and end_sec is not None and start_sec > end_sec:
+            return n_total, (n_total - lo) + hi  # wrap around midnight
+        return n_total, hi - lo
+
+    if start_sec is not None and end_sec is not None:
+        if start_sec <= end_sec:
+            mask = (secs >= start_sec) & (secs <= end_sec)
+        else:
+            # wrap around midnight
+            mask = (secs >= start_sec) | (secs <= end_sec)
+    elif start_sec is not None:
+        mask = secs >= start_sec
+    else:
+        mask = secs <= end_sec
+    return n_total, int(mask.sum())
 
 
 # -------------------------
 # GUI validation & control
 # -------------------------
-def on_time_entry_change(*_args):
-    s = start_var.get()
-    e = end_var.get()
-    s_ok = validate_time_string(s)
-    e_ok = validate_time_string(e)
-    theme = gui_themes[gui_theme_var.get()]
-    if s.strip() == "":
-        start_entry.config(bg=theme["ENTRY_BG"], fg=theme["ENTRY_FG"])
-    else:
-        start_entry.config(bg=theme["VALID_BG"] if s_ok else theme["INVALID_BG"], fg=theme["ENTRY_FG"])
-    if e.strip() == "":
-        end_entry.config(bg=theme["ENTRY_BG"], fg=theme["ENTRY_FG"])
+def _config_if_changed(widget, **opts):
+    """widget.config(**opts), skipping options already set to the same value through here."""
+    applied = widget.__dict__.setdefault("_applied_opts", {})
+    changed = {k: v for k, v in opts.items() if applied.get(k) != v}
+    if changed:
+        widget.config(**changed)
+        applied.update(changed)
+
+
+_validate_after_id = None
+_pending_time_fields = set()
+# last validation result per time entry, so only the edited one is re-checked
+_last_valid = {"start": True, "end": True}
+
+
+def on_time_entry_change(var_name=None, *_args):
+    # trace callback: a burst of keystrokes is validated once, 50 ms after the last one
+    global _validate_after_id
+    if var_name == str(start_var):
+        _pending_time_fields.add("start")
+    elif var_name == str(end_var):
+        _pending_time_fields.add("end")
     else:
-        end_entry.config(bg=theme["VALID_BG"] if e_ok else theme["INVALID_BG"], fg=theme["ENTRY_FG"])
-    run_button.config(state="normal" if (s_ok and e_ok) else "disabled")
+        _pending_time_fields.update(("start", "end"))
+    if _validate_after_id is not None:
+        root.after_cancel(_validate_after_id)
+    _validate_after_id = root.after(50, _apply_pending_time_validation)
+
+
+def _apply_pending_time_validation():
+    fields = tuple(_pending_time_fields)
+    _pending_time_fields.clear()
+    _apply_time_validation(fields)
+
+
+def _apply_time_validation(fields=("start", "end")):
+    """Re-validate and recolour the given time entries, then update the Run button."""
+    global _validate_after_id
+    _validate_after_id = None
+    for field in fields:
+        var, entry = (start_var, start_entry) if field == "start" else (end_var, end_entry)
+        v = var.get()
+        ok = validate_time_string(v)
+        _last_valid[field] = ok
+        _config_if_changed(entry, style=_TIME_ENTRY_STYLES[None if not v or v.isspace() else ok])
+    _config_if_changed(run_button, state="normal" if all(_last_valid.values()) else "disabled")
+
+
+@functools.lru_cache(maxsize=2)
+def _controls_state_script(state: str) -> str:
+    """Tcl script setting -state on every control in _STATEFUL_WIDGETS (built once per state)."""
+    # catch keeps a widget that rejects -state from stopping the rest
+    return "\n".join(f"catch {{{w} configure -state {state}}}" for w in _STATEFUL_WIDGETS)
 
 
 def _set_controls_state(enabled: bool):
     state = "normal" if enabled else "disabled"
-    widgets = (url_entry, path_entry, path_browse_btn, mission_entry, date_entry, interval_menu, out_entry, out_browse_btn,
-               start_entry, end_entry, run_button, plot_chk, legend_chk, plot_existing_btn, check_updates_btn)
-    for w in widgets:
-        try:
-            w.config(state=state)
-        except Exception:
-            pass
+    # one Tcl script instead of a configure round-trip per widget
+    root.tk.eval(_controls_state_script(state))
     if not enabled:
-        run_button.config(state="disabled")
+        _config_if_changed(run_button, state="disabled")
     else:
         s_ok = validate_time_string(start_var.get())
         e_ok = validate_time_string(end_var.get())
-        run_button.config(state="normal" if (s_ok and e_ok) else "disabled")
+        _config_if_changed(run_button, state="normal" if (s_ok and e_ok) else "disabled")
 
 
 # -------------------------
@@ -386,101 +504,178 @@ def start_conversion_worker():
         messagebox.showerror("Input error", "Start/End time entries are invalid. Use HH:MM or HHMM format.")
         return
 
-    argv = []
-    if path:
-        argv += ["--path", path]
-    else:
-        argv += ["--url", url]
-    if mission:
-        argv += ["--mission", mission]
-    if storm_date:
-        argv += ["--storm-date", storm_date]
-    argv += ["--interval", str(interval_i)]
-    argv += ["--out", out_file]
-    if start:
-        argv += ["--start", start]
-    if end:
-        argv += ["--end", end]
+    # (flag, value) pairs; a flag whose value is empty is left out
+    pairs = (("--path", path), ("--url", None if path else url), ("--mission", mission),
+             ("--storm-date", storm_date), ("--interval", str(interval_i)), ("--out", out_file),
+             ("--start", start), ("--end", end))
+    argv = [x for pair in pairs if pair[1] for x in pair]
 
     _set_controls_state(False)
     status_var.set("Running conversion...")
     prog.start(10)
 
-    t = threading.Thread(target=_worker_thread_target, args=(argv, out_file, do_plot, show_legend, coord_format, plot_theme, start, end), daemon=True)
-    t.start()
-    root.after(200, _poll_worker_queue)
+    _submit_conversion((argv, out_file, do_plot, show_legend, coord_format, plot_theme, start, end))
+
+
+def _submit_conversion(args: tuple):
+    """Queue a conversion for the worker thread, starting that thread on first use."""
+    global _conversion_thread
+    if _conversion_thread is None:
+        # daemon, like the per-run threads it replaces: closing the window mid-run doesn't wait
+        _conversion_thread = threading.Thread(target=_conversion_thread_main, name="recon10s-convert", daemon=True)
+        _conversion_thread.start()
+    job_queue.put(args)
+
+
+def _conversion_thread_main():
+    while True:
+        _worker_thread_target(*job_queue.get())
+
+
+# The converter runs as its own process (recon10s.py), so its parsing never holds the GIL
+# against the Tk loop and it can use its parse process pool; this thread just waits on it.
+CONVERTER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recon10s.py")
+_convert_proc: Optional[subprocess.Popen] = None
+
+
+def _run_converter(argv) -> Tuple[int, str]:
+    """Run recon10s.py with argv in a child interpreter; (returncode, stderr text)."""
+    global _convert_proc
+    _convert_proc = subprocess.Popen([sys.executable, CONVERTER_SCRIPT] + argv,
+                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                     creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    _out, err = _convert_proc.communicate()
+    return _convert_proc.returncode, err.decode("utf-8", errors="replace")
 
 
 def _worker_thread_target(argv, out_file, do_plot, show_legend, coord_format, plot_theme, start, end):
     result = {'success': False, 'rc': None, 'err': None, 'out_file': out_file, 'parsed': 0, 'filtered': 0}
     try:
-        try:
-            rc = recon10s.main(argv)
-        except SystemExit as se:
-            rc = getattr(se, "code", None)
+        rc, stderr_txt = _run_converter(argv)
         result['rc'] = rc
-        if os.path.exists(out_file):
+        if rc != 0:
+            # a failed run may leave an older file at out_file; never report that as this run's output
+            result['err'] = f"Converter exited with code {rc}"
+        else:
+            # counting opens the output, so a missing file shows up here without a separate stat
             try:
-                parsed, filtered = compute_counts(out_file, start, end)
-                result['parsed'] = parsed
-                result['filtered'] = filtered
-                result['success'] = True
+                result['parsed'], result['filtered'] = compute_counts(out_file, start, end)
+            except FileNotFoundError:
+                result['err'] = f"Output file not produced: {out_file}"
             except Exception:
-                result['success'] = True
-        else:
-            result['err'] = f"Output file not produced: {out_file}"
-            result['success'] = False
+                pass  # counts are informational; the output itself is there
+        if result['err'] is None:
+            result['success'] = True
+            result['preview'] = _read_preview(out_file)
+        elif stderr_txt.strip():
+            result['err'] += "\n\n" + stderr_txt.strip()[-2000:]
     except Exception as exc:
         result['err'] = f"Exception during conversion: {exc}"
         result['success'] = False
     worker_queue.put(result)
+    # wake the Tk loop (handled by _on_worker_event on the main thread)
+    try:
+        root.event_generate("<<WorkerDone>>", when="tail")
+    except (tk.TclError, RuntimeError):
+        pass  # window already closed
 
 
-def _poll_worker_queue():
+def _on_worker_event(_event=None):
+    # drain, so nothing is left behind if a wake-up event was dropped
+    while True:
+        try:
+            res = worker_queue.get_nowait()
+        except queue.Empty:
+            return
+        _on_worker_done(res)
+
+
+# HDOB preview: the worker thread reads a capped preview of the output (the full output
+# stays on disk); the Tk thread inserts it a chunk per event-loop turn so it stays responsive
+PREVIEW_MAX_CHARS = 2 * 1024 * 1024
+PREVIEW_CHUNK_CHARS = 64 * 1024
+PREVIEW_TAIL_LINES = 200
+_preview_gen = 0
+
+
+def _tail_lines(path: str, n: int) -> str:
+    """Last n lines of a file, found by scanning a memory map backwards for newlines."""
+    with open(path, "rb") as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = len(mm)
+            if pos and mm[pos - 1:pos] == b"\n":
+                pos -= 1  # ignore the final line terminator
+            for _ in range(n):
+                pos = mm.rfind(b"\n", 0, pos)
+                if pos < 0:
+                    break
+            return mm[pos + 1:].decode("utf-8", errors="ignore")
+
+
+def _read_preview(out_file: str) -> str:
+    """Preview text for the HDOB box (runs on the worker thread)."""
     try:
-        res = worker_queue.get_nowait()
-    except queue.Empty:
-        root.after(200, _poll_worker_queue)
-        return
-    _on_worker_done(res)
+        size = os.path.getsize(out_file)
+        if size > LARGE_HDOB_BYTES:
+            return (f"[showing last {PREVIEW_TAIL_LINES} lines of {size / (1024 * 1024):.1f} MB output; full output in file]\n"
+                    + _tail_lines(out_file, PREVIEW_TAIL_LINES))
+        with open(out_file, "r", encoding="utf-8", errors="ignore") as fh:
+            txt = fh.read(PREVIEW_MAX_CHARS)
+            if fh.read(1):
+                txt += f"\n... truncated (first {PREVIEW_MAX_CHARS // (1024 * 1024)} MB shown; full output in file) ...\n"
+        return txt
+    except FileNotFoundError:
+        return "(Output file missing)"
+    except Exception as exc:
+        return f"(Could not read output file: {exc})"
+
+
+def _show_preview(txt: str):
+    global _preview_gen
+    _preview_gen += 1  # abandons a previous preview that is still being inserted
+    hdob_text.delete("1.0", tk.END)
+    _insert_preview_chunk(_preview_gen, txt, 0)
+
+
+def _insert_preview_chunk(gen: int, txt: str, pos: int):
+    if gen != _preview_gen:
+        return  # superseded by a newer preview
+    hdob_text.insert(tk.END, txt[pos:pos + PREVIEW_CHUNK_CHARS])
+    pos += PREVIEW_CHUNK_CHARS
+    if pos < len(txt):
+        # idle callback: the redraw queued by this insert runs before the next chunk
+        root.after_idle(_insert_preview_chunk, gen, txt, pos)
+    else:
+        hdob_text.edit_modified(False)  # program output, not a user edit
 
 
 def _on_worker_done(result: dict):
-    prog.stop()
+    # all widget updates first, then one idle pass paints them before any dialog opens
+    prog.stop()  # also resets the bar to 0
     _set_controls_state(True)
     out_file = result.get('out_file')
-    if result.get('success'):
-        parsed = result.get('parsed', 0)
-        filtered = result.get('filtered', 0)
-        txt = ""
-        if os.path.exists(out_file):
-            try:
-                with open(out_file, "r", encoding="utf-8", errors="ignore") as fh:
-                    txt = fh.read()
-            except Exception as exc:
-                txt = f"(Could not read output file: {exc})"
-        else:
-            txt = "(Output file missing)"
-        hdob_text.delete("1.0", tk.END)
-        hdob_text.insert(tk.END, txt)
-        status_var.set(f"Parsed {parsed} records — {filtered} records in window")
-        if plot_var.get() and os.path.exists(out_file):
-            ask = messagebox.askyesno("Run plot?", "Conversion finished. Display plot now? (Plot opens a matplotlib window.)")
-            if ask:
-                try:
-                    recon10s_plot.main(out_file,
-                                      start_utc=start_var.get().strip() or None,
-                                      end_utc=end_var.get().strip() or None,
-                                      show_legend=legend_var.get(),
-                                      coord_format=coord_var.get(),
-                                      plot_theme=plot_theme_var.get(),
-                                      show_plot=True)
-                except Exception as exc:
-                    messagebox.showerror("Plot error", f"Plotting failed:\n{exc}")
+    ok = result.get('success')
+    if ok:
+        _show_preview(result.get('preview', ""))
+        status_var.set(f"Parsed {result.get('parsed', 0)} records — {result.get('filtered', 0)} records in window")
     else:
-        err = result.get('err') or f"Converter returned rc={result.get('rc')}"
         status_var.set("Conversion failed.")
-        messagebox.showerror("Conversion failed", err)
+    root.update_idletasks()
+
+    if not ok:
+        messagebox.showerror("Conversion failed", result.get('err') or f"Converter returned rc={result.get('rc')}")
+    elif plot_var.get():  # success means the worker found out_file
+        ask = messagebox.askyesno("Run plot?", "Conversion finished. Display plot now? (Plot opens a matplotlib window.)")
+        if ask:
+            try:
+                launch_plot(out_file,
+                            start_utc=start_var.get().strip() or None,
+                            end_utc=end_var.get().strip() or None,
+                            show_legend=legend_var.get(),
+                            coord_format=coord_var.get(),
+                            plot_theme=plot_theme_var.get())
+            except Exception as exc:
+                messagebox.showerror("Plot error", f"Plotting failed:\n{exc}")
 
 
 # -------------------------
@@ -498,19 +693,27 @@ gui_themes = {
         "VALID_BG": "#c6efce", "INVALID_BG": "#f8d7da", "TEXT_BG": "#ffffff"
     }
 }
+# ttk style of a time entry: None = blank, True = valid, False = invalid. The entries are
+# ttk.Entry, so a theme switch recolours them all through these styles (see apply_gui_theme)
+_TIME_ENTRY_STYLES = {None: "App.TEntry", True: "Valid.TEntry", False: "Invalid.TEntry"}
+
+
+_current_gui_theme = None
 
 
 def apply_gui_theme(theme_name: str):
+    global _current_gui_theme
+    if theme_name == _current_gui_theme:
+        return  # re-selecting the active theme: nothing to reconfigure
+    _current_gui_theme = theme_name
     theme = gui_themes.get(theme_name, gui_themes["dark"])
     root.configure(bg=theme["APP_BG"])
-    frame.configure(style="Main.TFrame")
     style.configure("Main.TFrame", background=theme["PANEL_BG"])
     style.configure("Main.TLabel", background=theme["PANEL_BG"], foreground=theme["LABEL_FG"])
-    entries = (url_entry, path_entry, mission_entry, date_entry, out_entry, start_entry, end_entry)
-    for e in entries:
-        e.config(bg=theme["ENTRY_BG"], fg=theme["ENTRY_FG"], insertbackground=theme["ENTRY_FG"])
-    hdob_text.config(bg=theme["TEXT_BG"], fg=theme["ENTRY_FG"], insertbackground=theme["ENTRY_FG"])
-    on_time_entry_change()
+    # every entry follows one of these styles, whatever their number
+    for style_name, bg_key in (("App.TEntry", "ENTRY_BG"), ("Valid.TEntry", "VALID_BG"), ("Invalid.TEntry", "INVALID_BG")):
+        style.configure(style_name, fieldbackground=theme[bg_key], foreground=theme["ENTRY_FG"], insertcolor=theme["ENTRY_FG"])
+    _config_if_changed(hdob_text, bg=theme["TEXT_BG"], fg=theme["ENTRY_FG"], insertbackground=theme["ENTRY_FG"])
 
 
 # -------------------------
@@ -756,24 +959,24 @@ padx = 8; pady = 6
 
 ttk.Label(main_tab, text="IWG1 URL:", style="Main.TLabel").grid(row=0, column=0, sticky="e", padx=padx, pady=pady)
 url_var = tk.StringVar()
-url_entry = tk.Entry(main_tab, textvariable=url_var, width=72)
+url_entry = ttk.Entry(main_tab, textvariable=url_var, width=72, style="App.TEntry")
 url_entry.grid(row=0, column=1, columnspan=2, sticky="w", padx=padx, pady=pady)
 
 ttk.Label(main_tab, text="Local IWG1 file:", style="Main.TLabel").grid(row=1, column=0, sticky="e", padx=padx, pady=pady)
 path_var = tk.StringVar()
-path_entry = tk.Entry(main_tab, textvariable=path_var, width=52)
+path_entry = ttk.Entry(main_tab, textvariable=path_var, width=52, style="App.TEntry")
 path_entry.grid(row=1, column=1, sticky="w", padx=padx, pady=pady)
 path_browse_btn = ttk.Button(main_tab, text="Browse...", style="Main.TButton", command=choose_local_iwg1)
 path_browse_btn.grid(row=1, column=2, sticky="w", padx=padx, pady=pady)
 
 ttk.Label(main_tab, text="Mission ID:", style="Main.TLabel").grid(row=2, column=0, sticky="e", padx=padx, pady=pady)
 mission_var = tk.StringVar(value="Put a mission name here.")
-mission_entry = tk.Entry(main_tab, textvariable=mission_var, width=72)
+mission_entry = ttk.Entry(main_tab, textvariable=mission_var, width=72, style="App.TEntry")
 mission_entry.grid(row=2, column=1, columnspan=2, sticky="w", padx=padx, pady=pady)
 
 ttk.Label(main_tab, text="Storm date (YYYYMMDD):", style="Main.TLabel").grid(row=3, column=0, sticky="e", padx=padx, pady=pady)
 date_var = tk.StringVar(value=dt.date.today().strftime("%Y%m%d"))
-date_entry = tk.Entry(main_tab, textvariable=date_var, width=20)
+date_entry = ttk.Entry(main_tab, textvariable=date_var, width=20, style="App.TEntry")
 date_entry.grid(row=3, column=1, sticky="w", padx=padx, pady=pady)
 
 ttk.Label(main_tab, text="Interval (s):", style="Main.TLabel").grid(row=4, column=0, sticky="e", padx=padx, pady=pady)
@@ -783,19 +986,23 @@ interval_menu.grid(row=4, column=1, sticky="w", padx=padx, pady=pady)
 
 ttk.Label(main_tab, text="Output HDOB file:", style="Main.TLabel").grid(row=5, column=0, sticky="e", padx=padx, pady=pady)
 out_var = tk.StringVar(value="")
-out_entry = tk.Entry(main_tab, textvariable=out_var, width=52)
+out_entry = ttk.Entry(main_tab, textvariable=out_var, width=52, style="App.TEntry")
 out_entry.grid(row=5, column=1, sticky="w", padx=padx, pady=pady)
 out_browse_btn = ttk.Button(main_tab, text="Choose...", style="Main.TButton", command=choose_output_file)
 out_browse_btn.grid(row=5, column=2, sticky="w", padx=padx, pady=pady)
 
 ttk.Label(main_tab, text="Start UTC (HH:MM or HHMM):", style="Main.TLabel").grid(row=6, column=0, sticky="e", padx=padx, pady=pady)
+# keystrokes that cannot be part of a time are rejected by Tk before any trace runs
+_time_vcmd = (root.register(_tk_validate_time), "%P")
 start_var = tk.StringVar(value="")
-start_entry = tk.Entry(main_tab, textvariable=start_var, width=20)
+start_entry = ttk.Entry(main_tab, textvariable=start_var, width=20, style="App.TEntry",
+                        validate="key", validatecommand=_time_vcmd)
 start_entry.grid(row=6, column=1, sticky="w", padx=padx, pady=pady)
 
 ttk.Label(main_tab, text="End UTC (HH:MM or HHMM):", style="Main.TLabel").grid(row=7, column=0, sticky="e", padx=padx, pady=pady)
 end_var = tk.StringVar(value="")
-end_entry = tk.Entry(main_tab, textvariable=end_var, width=20)
+end_entry = ttk.Entry(main_tab, textvariable=end_var, width=20, style="App.TEntry",
+                      validate="key", validatecommand=_time_vcmd)
 end_entry.grid(row=7, column=1, sticky="w", padx=padx, pady=pady)
 
 plot_var = tk.BooleanVar(value=True)
@@ -870,6 +1077,11 @@ ttk.Label(settings_tab, textvariable=latest_var)\
 check_updates_btn = ttk.Button(settings_tab, text="Check for updates now", style="Main.TButton", command=on_check_updates_now)
 check_updates_btn.grid(row=6, column=2, sticky="w", padx=padx, pady=(6,12))
 
+# controls locked while a conversion runs (_set_controls_state); run_button is handled
+# there separately, as unlocking it also depends on the time entries being valid
+_STATEFUL_WIDGETS = (url_entry, path_entry, path_browse_btn, mission_entry, date_entry, interval_menu, out_entry,
+                     out_browse_btn, start_entry, end_entry, plot_chk, legend_chk, plot_existing_btn, check_updates_btn)
+
 ToolTip(save_btn, f"Settings file: {SETTINGS_FILE}")
 ToolTip(reset_btn, f"Settings file: {SETTINGS_FILE}")
 ToolTip(reset_restart_btn, f"Settings file: {SETTINGS_FILE}")
@@ -923,6 +1135,7 @@ reset_restart_btn.config(command=on_reset_and_restart)
 # -------------------------
 start_var.trace_add("write", on_time_entry_change)
 end_var.trace_add("write", on_time_entry_change)
+root.bind("<<WorkerDone>>", _on_worker_event)
 
 # Set widget states based on loaded settings
 coord_var.set(settings.get("coord_format", DEFAULTS["coord_format"]))
@@ -937,8 +1150,7 @@ def on_gui_theme_change():
 
 apply_gui_theme(gui_theme_var.get())
 
-on_time_entry_change()
-run_button.config(state="normal" if (validate_time_string(start_var.get()) and validate_time_string(end_var.get())) else "disabled")
+_apply_time_validation()
 
 # layout resizing
 root.columnconfigure(0, weight=1)
@@ -949,5 +1161,9 @@ url_entry.focus_set()
 
 root.mainloop()
 
+for proc in _plot_procs + [_convert_proc]:
+    if proc is not None and proc.poll() is None:
+        proc.terminate()
+
 
 
@@ -3,10 +3,13 @@
 recon10s_plot.py — HDOB plotter with coord_format and plot_theme support
 
 Functions:
- - parse_hdob_file(hdob_file) -> times, times_tup, lats, lons, mslps, wind_dirs, wind_spds
+ - parse_hdob_file(hdob_file) -> times, secs, lats, lons, mslps, wind_dirs, wind_spds (NumPy arrays)
+ - count_hdob_records(hdob_file) -> number of records parse_hdob_file would return (from hdob_records)
  - _time_input_to_seconds(s) -> seconds-of-day or None
  - main(hdob_file, start_utc=None, end_utc=None, show_legend=False,
         coord_format='decimal', plot_theme='dark', show_plot=True)
+ - command line: recon10s_plot.py HDOB_FILE [--start T] [--end T] [--legend]
+        [--coord-format decimal|dms] [--plot-theme dark|light] [--no-show]
 
 Plot themes:
  - 'dark': black background, white labels/lines
@@ -19,20 +22,44 @@ Coordinate formats:
 Saved PNG is written next to the HDOB file with the same basename (e.g. myfile.png).
 """
 from __future__ import annotations
+import functools
 import os
 import re
+import sys
 from typing import List, Optional, Tuple
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 
-# Regex tokens for HDOB-style lat/lon tokens (LLMMH / LLLMMH)
-_RE_LAT = re.compile(r"^(\d{2})(\d{2})(\d{2})?([NS])$")
-_RE_LON = re.compile(r"^(\d{3})(\d{2})(\d{2})?([EW])$")
-_RE_WIND = re.compile(r"^(\d{3})(\d{3})$")
-_RE_PPPP = re.compile(r"^\d{4}$")
+# record counting lives in the dependency-free hdob_records so the GUI can use it without matplotlib
+from hdob_records import count_hdob_records
+
+# CRS objects are immutable; build them once and share them across calls and plots
+_PLATE_CARREE = ccrs.PlateCarree()
+_MERCATOR = ccrs.Mercator()
+# 50m Natural Earth map features, built once and shared by every plot
+_LAND_50M = cfeature.LAND.with_scale("50m")
+_COAST_50M = cfeature.COASTLINE.with_scale("50m")
+_BORDERS_50M = cfeature.BORDERS.with_scale("50m")
+
+# Regex tokens for HDOB-style lat/lon tokens (LLMMH / LLLMMH); whole-token patterns,
+# applied with fullmatch (tokens come from str.split, so there is no trailing newline).
+# Group 4 only matches the negative hemisphere (S / W), so the sign test works for str and bytes.
+_RE_LAT = re.compile(r"(\d{2})(\d{2})(\d{2})?(?:N|(S))")
+_RE_LON = re.compile(r"(\d{3})(\d{2})(\d{2})?(?:E|(W))")
+# The same token patterns over bytes, for record lines parsed without decoding (ASCII only)
+_RE_LAT_B = re.compile(_RE_LAT.pattern.encode())
+_RE_LON_B = re.compile(_RE_LON.pattern.encode())
+# Separators str.split/str.strip honour that bytes.split/bytes.strip do not (ASCII lines only)
+_RE_STR_ONLY_SPACE_B = re.compile(rb"[\x1c-\x1f]")
+
+# Bulletin header/trailer lines (URNT15 KNHC ..., $$) never hold a record
+_HEADER_PREFIXES = (b"URNT", b"KNHC", b"$$")
+# Shortest possible record: "HHMM LLMMH LLLMMH" (time, lat, lon and two separators)
+_MIN_RECORD_LEN = 17
 
 # Color buckets in knots as specified by user (RGB tuples)
 _COLOR_BUCKETS = [
@@ -52,43 +79,63 @@ _COLOR_BUCKETS = [
     (113, 137, (255, 166, 193)),
     (137, float("inf"), (253, 105, 110)),
 ]
+# _COLOR_BUCKETS as lookup tables: bucket k is _BUCKET_EDGES[k] <= kts < _BUCKET_EDGES[k+1],
+# found for many speeds at once with searchsorted. _BUCKET_RGB has one row per bucket plus a
+# final grey row, which index -1 (a speed below the first edge) picks up.
+_BUCKET_EDGES = np.array([lo for lo, _hi, _rgb in _COLOR_BUCKETS] + [float("inf")])
+_BUCKET_RGB = np.array([[r/255.0, g/255.0, b/255.0] for _lo, _hi, (r, g, b) in _COLOR_BUCKETS] + [[0.8, 0.8, 0.8]])
 
-def _tok_to_latlon(lat_tok: str, lon_tok: str) -> Optional[Tuple[float, float]]:
+def _speed_buckets(spds) -> np.ndarray:
+    """_COLOR_BUCKETS index of each wind speed (kt); -1 (grey) below the first bucket."""
+    return np.searchsorted(_BUCKET_EDGES, spds, side="right") - 1
+
+
+def _tok_to_latlon(lat_tok: str, lon_tok: str,
+                   _lat_match=_RE_LAT.fullmatch, _lon_match=_RE_LON.fullmatch) -> Optional[Tuple[float, float]]:
     """Parse HDOB tokens like 1917N, 05758W or 191704N, 0575804W (supports optional seconds)"""
-    mlat = _RE_LAT.match(lat_tok)
-    mlon = _RE_LON.match(lon_tok)
-    if not (mlat and mlon):
+    mlat = _lat_match(lat_tok)
+    if mlat is None:
+        return None
+    mlon = _lon_match(lon_tok)
+    if mlon is None:
         return None
     deg = int(mlat.group(1)); minutes = int(mlat.group(2)); secs = int(mlat.group(3)) if mlat.group(3) else 0
     lat = deg + minutes/60.0 + secs/3600.0
-    if mlat.group(4) == "S": lat = -lat
+    if mlat.group(4): lat = -lat
     deg_lon = int(mlon.group(1)); minutes_lon = int(mlon.group(2)); secs_lon = int(mlon.group(3)) if mlon.group(3) else 0
     lon = deg_lon + minutes_lon/60.0 + secs_lon/3600.0
-    if mlon.group(4) == "W": lon = -lon
+    if mlon.group(4): lon = -lon
     return lat, lon
 
-def _find_mslp_and_wind(parts: List[str]):
-    """Try to locate PPPP and WWWSSS tokens in the token list."""
+def _find_mslp_and_wind(parts: List[str], _isdec=str.isdecimal):
+    """
+    Try to locate PPPP and WWWSSS tokens in the token list; the last match of each wins.
+    A token qualifies by length and digits alone: str.isdecimal accepts exactly what \\d
+    matches (bytes tokens pass bytes.isdigit, ASCII digits only).
+    """
     pppp_idx = None
     wind_tuple = None
-    for idx, tok in enumerate(parts):
-        t = tok.strip()
-        m = _RE_WIND.match(t)
-        if m:
-            d = int(m.group(1)); s = int(m.group(2))
-            if 0 <= d <= 360 and 0 <= s <= 300:
-                wind_tuple = (d, s)
-                # don't return early — prefer to find explicit PPPP too
+    # scan from the end so the search stops once both are found
+    for idx in range(len(parts) - 1, -1, -1):
+        tok = parts[idx]
+        n = len(tok)
+        if n == 6:
+            if wind_tuple is not None:
                 continue
-        if _RE_PPPP.match(t):
-            try:
-                val = int(t)
-                # PPPP is tenths of hPa; restrict to plausible range
-                if 8000 <= val <= 11000:
-                    pppp_idx = idx
-                    continue
-            except Exception:
-                pass
+            if _isdec(tok):
+                d = int(tok[:3]); s = int(tok[3:])
+                if 0 <= d <= 360 and 0 <= s <= 300:
+                    wind_tuple = (d, s)
+                    if pppp_idx is not None:
+                        break
+        elif n == 4:
+            if pppp_idx is not None:
+                continue
+            # PPPP is tenths of hPa; restrict to plausible range
+            if _isdec(tok) and 8000 <= int(tok) <= 11000:
+                pppp_idx = idx
+                if wind_tuple is not None:
+                    break
     return pppp_idx, wind_tuple
 
 def _parse_time_token(tstr: str):
@@ -96,6 +143,10 @@ def _parse_time_token(tstr: str):
     t = tstr.strip()
     if not t.isdigit():
         return None
+    if type(t) is bytes and (len(t) == 6 or len(t) == 4):
+        # bytes.isdigit means ASCII digits: each field straight from the byte codes
+        return ((t[0] - 48) * 10 + (t[1] - 48), (t[2] - 48) * 10 + (t[3] - 48),
+                (t[4] - 48) * 10 + (t[5] - 48) if len(t) == 6 else 0)
     if len(t) == 6: return int(t[0:2]), int(t[2:4]), int(t[4:6])
     if len(t) == 4: return int(t[0:2]), int(t[2:4]), 0
     return None
@@ -103,6 +154,12 @@ def _parse_time_token(tstr: str):
 def _hhmm_to_seconds(hhmm: Optional[str]) -> Optional[int]:
     if hhmm is None: return None
     s = hhmm.strip()
+    n = len(s)
+    if (n == 4 or n == 6) and s.isascii() and s.isdigit():
+        # HHMM / HHMMSS, the common case: seconds straight from the digit codes
+        b = s.encode("ascii")
+        return (((b[0] - 48) * 10 + b[1] - 48) * 3600 + ((b[2] - 48) * 10 + b[3] - 48) * 60
+                + ((b[4] - 48) * 10 + b[5] - 48 if n == 6 else 0))
     if ":" in s:
         parts = s.split(":")
         if len(parts) == 2: hh, mm, ss = int(parts[0]), int(parts[1]), 0
@@ -113,93 +170,210 @@ def _hhmm_to_seconds(hhmm: Optional[str]) -> Optional[int]:
         else: return None
     return hh*3600 + mm*60 + ss
 
-def _speed_to_rgb_normalized(kts: float):
-    for lo, hi, rgb in _COLOR_BUCKETS:
-        if lo <= kts < hi:
-            return (rgb[0]/255.0, rgb[1]/255.0, rgb[2]/255.0)
-    return (0.8, 0.8, 0.8)
-
-def _wind_to_uv_knots(dir_deg: int, spd_kt: int) -> Tuple[float, float]:
+def _wind_to_uv_knots(dir_deg, spd_kt):
+    """u, v (kt) of wind blowing from dir_deg at spd_kt; works on whole arrays at once."""
     rad = np.deg2rad(dir_deg)
     u = -spd_kt * np.sin(rad)
     v = -spd_kt * np.cos(rad)
-    return float(u), float(v)
+    return u, v
 
-def parse_hdob_file(hdob_file: str):
+def _parse_hdob_line(line: str, _headers=("URNT", "KNHC", "$$"), _latlon=_tok_to_latlon,
+                     _find=_find_mslp_and_wind, _isdec=str.isdecimal):
     """
-    Parse the HDOB file and return:
-    times (list of raw time tokens), times_tup ([(hh,mm,ss)...]),
-    lats, lons, mslps (hPa), wind_dirs (deg), wind_spds (kt)
+    Token parser for one stripped HDOB line, any layout:
+    (time_tok, (hh,mm,ss), lat, lon, mslp, wind_dir, wind_spd), or None if it is not a record.
     """
-    times = []; times_tup = []; lats = []; lons = []; mslps = []; wind_dirs = []; wind_spds = []
-    with open(hdob_file, "r", encoding="utf-8") as fh:
-        for raw in fh:
-            line = raw.strip()
-            if not line: continue
-            if any(line.startswith(p) for p in ("URNT", "KNHC", "$$")): continue
-            parts = line.split()
-            if len(parts) < 3: continue
-            time_tok = parts[0]; lat_tok = parts[1]; lon_tok = parts[2]
-            latlon = _tok_to_latlon(lat_tok, lon_tok)
-            if latlon is None:
-                # try to find lat/lon somewhere else in the tokens
-                found = False
-                for i in range(1, len(parts)-1):
-                    maybe = _tok_to_latlon(parts[i], parts[i+1])
-                    if maybe:
-                        latlon = maybe; found = True; break
-                if not found:
-                    continue
-            lat_dec, lon_dec = latlon
-            pppp_idx, wind_tok = _find_mslp_and_wind(parts)
+    if len(line) < _MIN_RECORD_LEN: return None
+    if line.startswith(_headers): return None
+    parts = line.split()
+    if len(parts) < 3: return None
+    time_tok = parts[0]; lat_tok = parts[1]; lon_tok = parts[2]
+    latlon = _latlon(lat_tok, lon_tok)
+    if latlon is None:
+        # try to find lat/lon somewhere else in the tokens
+        found = False
+        for i in range(1, len(parts)-1):
+            maybe = _latlon(parts[i], parts[i+1])
+            if maybe:
+                latlon = maybe; found = True; break
+        if not found:
+            return None
+    lat_dec, lon_dec = latlon
+    pppp_idx, wind_tok = _find(parts)
+    mslp_val = None
+    if pppp_idx is not None:
+        try:
+            mslp_val = int(parts[pppp_idx]) / 10.0
+        except Exception:
             mslp_val = None
-            if pppp_idx is not None:
+    else:
+        # fallback scanning other likely spots
+        for alt in (3,4,5,6):
+            if alt < len(parts) and len(parts[alt]) == 4 and _isdec(parts[alt]):
                 try:
-                    mslp_val = int(parts[pppp_idx]) / 10.0
+                    vv = int(parts[alt])
+                    if 8000 <= vv <= 11000:
+                        mslp_val = vv / 10.0; break
                 except Exception:
-                    mslp_val = None
-            else:
-                # fallback scanning other likely spots
-                for alt in (3,4,5,6):
-                    if alt < len(parts) and _RE_PPPP.match(parts[alt]):
-                        try:
-                            vv = int(parts[alt])
-                            if 8000 <= vv <= 11000:
-                                mslp_val = vv / 10.0; break
-                        except Exception:
-                            pass
-            dir_deg = None; spd_kt = None
-            if wind_tok is not None:
-                dir_deg, spd_kt = wind_tok
-            ttt = _parse_time_token(time_tok)
-            if ttt is None: continue
-            times.append(time_tok); times_tup.append(ttt)
-            lats.append(lat_dec); lons.append(lon_dec); mslps.append(mslp_val)
-            wind_dirs.append(dir_deg); wind_spds.append(spd_kt)
-    return times, times_tup, lats, lons, mslps, wind_dirs, wind_spds
+                    pass
+    dir_deg = None; spd_kt = None
+    if wind_tok is not None:
+        dir_deg, spd_kt = wind_tok
+    ttt = _parse_time_token(time_tok)
+    if ttt is None: return None
+    return time_tok, ttt, lat_dec, lon_dec, mslp_val, dir_deg, spd_kt
+
+# _parse_hdob_line over an ASCII line as bytes, without decoding it; time_tok comes back as bytes
+_parse_hdob_line_bytes = functools.partial(
+    _parse_hdob_line, _headers=_HEADER_PREFIXES,
+    _latlon=functools.partial(_tok_to_latlon, _lat_match=_RE_LAT_B.fullmatch, _lon_match=_RE_LON_B.fullmatch),
+    _find=functools.partial(_find_mslp_and_wind, _isdec=bytes.isdigit), _isdec=bytes.isdigit)
+
+# The standard HDOB record line, as recon10s writes it and NHC bulletins carry it:
+#   hhmmss LLLLH NNNNNH PPPP GGGGG XXXX sTTT sddd wwwSSS MMM KKK sss FF
+# Template codes: 9 = ASCII digit, N = N/S, E = E/W, s = printable non-digit, x = printable, ' ' = space.
+# Lines of exactly this shape are decoded column-wise with NumPy (_parse_fixed_lines); for
+# them _parse_hdob_line would take lat/lon from tokens 1-2, wind from token 8 (when in range)
+# and MSLP from the last in-range of tokens 3 and 5 -- no other token can match.
+_FIXED_TEMPLATE = b"999999 9999N 99999E 9999 xxxxx 9999 sxxx sxxx 999999 xxx xxx xxx xx"
+_FIXED_WIDTH = len(_FIXED_TEMPLATE)
+_FIXED_CODES = np.frombuffer(_FIXED_TEMPLATE, dtype=np.uint8)
+
+def _fixed_number(d: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """Integer value of digit columns start:stop of a (n, width) digit-value array."""
+    return d[:, start:stop] @ (10 ** np.arange(stop - start - 1, -1, -1))
+
+def _parse_fixed_lines(a: np.ndarray):
+    """
+    Decode an (n, _FIXED_WIDTH) uint8 array of candidate lines.
+    Returns (ok mask, times, secs, lats, lons, mslps, wind_dirs, wind_spds) for the ok rows;
+    mslps is float with NaN where no in-range PPPP token is present.
+    """
+    printable = (a > 32) & (a < 127)
+    digit = (a >= 48) & (a <= 57)
+    c = _FIXED_CODES
+    ok = ((a[:, c == 32] == 32).all(1)
+          & digit[:, c == ord("9")].all(1)
+          & printable[:, c == ord("x")].all(1)
+          & (printable & ~digit)[:, c == ord("s")].all(1)
+          & np.isin(a[:, 11], (ord("N"), ord("S")))
+          & np.isin(a[:, 18], (ord("E"), ord("W"))))
+    a = a[ok]
+    d = a.astype(np.int64) - 48
+    wind_dirs = _fixed_number(d, 46, 49); wind_spds = _fixed_number(d, 49, 52)
+    # a wind token out of range leaves the time token as the wind: token parser
+    in_range = (wind_dirs <= 360) & (wind_spds <= 300)
+    ok[ok] = in_range
+    a = a[in_range]; d = d[in_range]; wind_dirs = wind_dirs[in_range]; wind_spds = wind_spds[in_range]
+    lats = _fixed_number(d, 7, 9) + _fixed_number(d, 9, 11) / 60.0
+    lats = np.where(a[:, 11] == ord("S"), -lats, lats)
+    lons = _fixed_number(d, 13, 16) + _fixed_number(d, 16, 18) / 60.0
+    lons = np.where(a[:, 18] == ord("W"), -lons, lons)
+    p3 = _fixed_number(d, 20, 24); p5 = _fixed_number(d, 31, 35)
+    mslps = np.where((p5 >= 8000) & (p5 <= 11000), p5 / 10.0,
+                     np.where((p3 >= 8000) & (p3 <= 11000), p3 / 10.0, np.nan))
+    times = np.ascontiguousarray(a[:, :6]).view("S6").ravel().astype("U6")
+    secs = _fixed_number(d, 0, 2) * 3600 + _fixed_number(d, 2, 4) * 60 + _fixed_number(d, 4, 6)
+    return ok, times, secs, lats, lons, mslps, wind_dirs, wind_spds
+
+@functools.lru_cache(maxsize=8)
+def _parse_cached(hdob_file: str, mtime_ns: int, size: int):
+    """
+    parse_hdob_file for one version of a file; mtime_ns and size only key the cache.
+    The file is read in one go; standard fixed-layout record lines are decoded together
+    with NumPy, any other line by the token parser (_parse_hdob_line).
+    """
+    with open(hdob_file, "rb") as fh:
+        data = fh.read()
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    buf = np.frombuffer(data, dtype=np.uint8)
+    nl = np.flatnonzero(buf == 10)
+    starts = np.concatenate(([0], nl + 1))
+    ends = np.concatenate((nl, [len(buf)]))
+
+    fixed = np.flatnonzero(ends - starts == _FIXED_WIDTH)
+    ok, *fast = _parse_fixed_lines(buf[starts[fixed, None] + np.arange(_FIXED_WIDTH)])
+    fast_idx = fixed[ok]
+    slow = np.ones(len(starts), dtype=bool)
+    slow[fast_idx] = False
+    slow_lines = np.flatnonzero(slow).tolist()
+
+    # token-parsed records, written into arrays sized for the worst case (every slow line a record)
+    n = len(slow_lines)
+    s_line = np.empty(n, dtype=np.intp); s_secs = np.empty(n, dtype=np.int32)
+    s_lats = np.empty(n); s_lons = np.empty(n); s_mslps = np.full(n, np.nan)
+    s_dirs = np.full(n, -1, dtype=np.int16); s_spds = np.full(n, -1, dtype=np.int16)
+    s_times = []
+    k = 0
+    for i in slow_lines:
+        raw = data[starts[i]:ends[i]].strip()
+        if len(raw) < _MIN_RECORD_LEN or raw.startswith(_HEADER_PREFIXES):
+            continue  # short and bulletin header/trailer lines are rejected before decoding
+        if raw.isascii() and _RE_STR_ONLY_SPACE_B.search(raw) is None:
+            # plain ASCII: bytes tokens split and match exactly as the decoded str would
+            rec = _parse_hdob_line_bytes(raw)
+            if rec is None:
+                continue
+            rec = (rec[0].decode("ascii"),) + rec[1:]
+        else:
+            rec = _parse_hdob_line(raw.decode("utf-8", errors="replace").strip())
+            if rec is None:
+                continue
+        time_tok, (hh, mm, ss), s_lats[k], s_lons[k], mslp, wind_dir, wind_spd = rec
+        s_line[k] = i; s_secs[k] = hh*3600 + mm*60 + ss
+        if mslp is not None: s_mslps[k] = mslp
+        if wind_dir is not None: s_dirs[k] = wind_dir; s_spds[k] = wind_spd
+        s_times.append(time_tok)
+        k += 1
+
+    cols = [np.concatenate((f, sl[:k])) for f, sl in zip(
+        fast, (np.array(s_times, dtype=str), s_secs, s_lats, s_lons, s_mslps, s_dirs, s_spds))]
+    cols[1] = cols[1].astype(np.int32); cols[5] = cols[5].astype(np.int16); cols[6] = cols[6].astype(np.int16)
+    line_of = np.concatenate((fast_idx, s_line[:k]))
+    if np.any(line_of[1:] < line_of[:-1]):
+        # interleave the token-parsed records back into file order
+        order = np.argsort(line_of, kind="stable")
+        cols = [col[order] for col in cols]
+    for col in cols:
+        col.flags.writeable = False  # shared by every caller that hits the cache
+    return tuple(cols)
+
+def parse_hdob_file(hdob_file: str):
+    """
+    Parse the HDOB file and return NumPy arrays, one entry per record in file order:
+    times (raw time tokens, str), secs (seconds of day, int32), lats, lons (float64),
+    mslps (hPa, float64, NaN if absent), wind_dirs (deg), wind_spds (kt) (int16, -1 if absent)
+
+    Results are cached per (path, mtime, size), so replotting an unchanged file does not
+    parse it again; the arrays are read-only.
+    """
+    path = os.path.abspath(hdob_file)
+    st = os.stat(path)
+    return _parse_cached(path, st.st_mtime_ns, st.st_size)
 
 # expose helper for GUI usage
 _time_input_to_seconds = _hhmm_to_seconds
 
-def _decimal_to_dms_str(val: float, is_lat: bool) -> str:
-    """Convert decimal degrees to DMS string with hemisphere."""
-    hemi = ""
-    if is_lat:
-        hemi = "N" if val >= 0 else "S"
-    else:
-        hemi = "E" if val >= 0 else "W"
-    aval = abs(val)
-    deg = int(aval)
-    minutes = int((aval - deg) * 60)
-    seconds = int(round((aval - deg - minutes/60.0) * 3600.0))
+def _dms_batch(vals, is_lat: bool) -> List[str]:
+    """Convert decimal degrees to DMS strings with hemisphere; the arithmetic runs in NumPy, only the f-string per value in Python."""
+    vals = np.asarray(vals, dtype=np.float64)
+    hemis = np.where(vals >= 0, "N" if is_lat else "E", "S" if is_lat else "W").tolist()
+    aval = np.abs(vals)
+    deg = np.floor(aval)
+    minutes = np.floor((aval - deg) * 60)
+    seconds = np.round((aval - deg - minutes / 60.0) * 3600.0)
     # fix rollovers
-    if seconds == 60:
-        seconds = 0
-        minutes += 1
-    if minutes == 60:
-        minutes = 0
-        deg += 1
-    return f"{deg}°{minutes:02d}'{seconds:02d}\"{hemi}"
+    roll = seconds == 60
+    seconds[roll] = 0; minutes += roll
+    roll = minutes == 60
+    minutes[roll] = 0; deg += roll
+    return [f"{d}°{m:02d}'{sec:02d}\"{h}" for d, m, sec, h in zip(
+        deg.astype(np.int64).tolist(), minutes.astype(np.int64).tolist(), seconds.astype(np.int64).tolist(), hemis)]
+
+def _decimal_to_dms_str(val: float, is_lat: bool) -> str:
+    """Convert decimal degrees to DMS string with hemisphere (one value of _dms_batch)."""
+    return _dms_batch([val], is_lat)[0]
 
 def _format_coord_for_display(lat: float, lon: float, coord_format: str = "decimal") -> str:
     if coord_format == "dms":
@@ -207,92 +381,102 @@ def _format_coord_for_display(lat: float, lon: float, coord_format: str = "decim
     else:
         return f"{lat:.4f}, {lon:.4f}"
 
+def _format_coords_for_display(lats, lons, coord_format: str = "decimal") -> List[str]:
+    """_format_coord_for_display for whole lat/lon arrays at once."""
+    if coord_format == "dms":
+        return [f"{a}, {o}" for a, o in zip(_dms_batch(lats, True), _dms_batch(lons, False))]
+    else:
+        return [f"{lat:.4f}, {lon:.4f}" for lat, lon in zip(np.asarray(lats).tolist(), np.asarray(lons).tolist())]
+
 def main(hdob_file: str,
          start_utc: Optional[str] = None,
          end_utc: Optional[str] = None,
          show_legend: bool = False,
          coord_format: str = "decimal",
          plot_theme: str = "dark",
-         show_plot: bool = True):
+         show_plot: bool = True) -> Optional[str]:
     """
     Create a plot for HDOB file.
 
     coord_format: 'decimal' or 'dms'
     plot_theme: 'dark' or 'light'
     show_plot: if False, only save PNG and return
+    Returns the saved PNG path, or None when there was nothing to plot (reason on stderr).
     """
     if not os.path.exists(hdob_file):
         raise FileNotFoundError(hdob_file)
 
-    times, times_tup, lats, lons, mslps, wind_dirs, wind_spds = parse_hdob_file(hdob_file)
-    if not lats:
-        print("No valid HDOB points found.")
+    times, secs, lats, lons, mslps, wind_dirs, wind_spds = parse_hdob_file(hdob_file)
+    if not len(lats):
+        print("No valid HDOB points found.", file=sys.stderr)
         return
 
-    secs = [hh*3600 + mm*60 + ss for (hh, mm, ss) in times_tup]
     start_sec = _hhmm_to_seconds(start_utc) if start_utc else None
     end_sec = _hhmm_to_seconds(end_utc) if end_utc else None
-    idxs = []
-    for i, s in enumerate(secs):
-        keep = True
-        if start_sec is not None and end_sec is not None:
-            if start_sec <= end_sec:
-                keep = (start_sec <= s <= end_sec)
-            else:
-                keep = (s >= start_sec or s <= end_sec)
-        elif start_sec is not None:
-            keep = (s >= start_sec)
-        elif end_sec is not None:
-            keep = (s <= end_sec)
-        if keep:
-            idxs.append(i)
-
-    print(f"Total records: {len(lats)}; filtered for window: {len(idxs)}")
-    if not idxs:
-        print("No records in requested window.")
+    # window mask over all records in one expression (end < start wraps past midnight)
+    if start_sec is not None and end_sec is not None:
+        if start_sec <= end_sec:
+            keep = (secs >= start_sec) & (secs <= end_sec)
+        else:
+            keep = (secs >= start_sec) | (secs <= end_sec)
+    elif start_sec is not None:
+        keep = secs >= start_sec
+    elif end_sec is not None:
+        keep = secs <= end_sec
+    else:
+        keep = np.ones(len(secs), dtype=bool)
+
+    n_window = int(np.count_nonzero(keep))
+    print(f"Total records: {len(lats)}; filtered for window: {n_window}")
+    if not n_window:
+        print("No records in requested window.", file=sys.stderr)
         return
 
-    px=[]; py=[]; uu=[]; vv=[]; colors=[]; pm=[]
-    for i in idxs:
-        d = wind_dirs[i]; s = wind_spds[i]
-        if d is None or s is None:
-            continue
-        lon = lons[i]; lat = lats[i]
-        u, v = _wind_to_uv_knots(d, s)
-        c = _speed_to_rgb_normalized(s)
-        px.append(lon); py.append(lat); uu.append(u); vv.append(v); colors.append(c); pm.append(mslps[i])
-    if not px:
-        print("No wind-bearing points to plot in the selected window.")
+    # records in the window that carry a wind
+    sel = np.flatnonzero(keep & (wind_dirs >= 0))
+    if not len(sel):
+        print("No wind-bearing points to plot in the selected window.", file=sys.stderr)
         return
 
-    px = np.array(px); py = np.array(py); uu = np.array(uu); vv = np.array(vv); pm = np.array(pm)
-    color_groups = {}
-    for i, c in enumerate(colors):
-        color_groups.setdefault(c, []).append(i)
+    px = lons[sel]; py = lats[sel]; pm = mslps[sel]
+    spds = wind_spds[sel].astype(np.int64)
+    uu, vv = _wind_to_uv_knots(wind_dirs[sel].astype(np.float64), spds)  # all points in one pass
+    # colour bucket of every point in one searchsorted; barbs are drawn per bucket
+    buckets = _speed_buckets(spds)
+    present, first_seen = np.unique(buckets, return_index=True)
+    present = present[np.argsort(first_seen)]  # draw buckets in order of first appearance
 
     # Choose theme options
     dark = (plot_theme == "dark")
     if dark:
-        fig = plt.figure(figsize=(11, 8), facecolor="black")
-        ax = plt.axes(projection=ccrs.Mercator(), facecolor="black")
+        face = "black"
         land_face = "#222222"; coast_color = "#cccccc"; border_color = "#888888"
         grid_color = "white"; grid_alpha = 0.25; text_color = "white"
     else:
-        fig = plt.figure(figsize=(11, 8), facecolor="white")
-        ax = plt.axes(projection=ccrs.Mercator(), facecolor="white")
+        face = "white"
         land_face = "#eaeaea"; coast_color = "#222222"; border_color = "#333333"
         grid_color = "black"; grid_alpha = 0.2; text_color = "black"
 
+    # pyplot (and its GUI backend) only when a window is wanted; a save-only plot is a
+    # plain Agg figure that pyplot never registers, so nothing accumulates across runs
+    if show_plot:
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(11, 8), facecolor=face)
+    else:
+        fig = Figure(figsize=(11, 8), facecolor=face)
+        FigureCanvasAgg(fig)
+    ax = fig.add_subplot(projection=_MERCATOR, facecolor=face)
+
     lonmin, lonmax = float(np.min(px)), float(np.max(px))
     latmin, latmax = float(np.min(py)), float(np.max(py))
     margin_lon = max(0.5, (lonmax - lonmin) * 0.12)
     margin_lat = max(0.5, (latmax - latmin) * 0.12)
-    ax.set_extent([lonmin - margin_lon, lonmax + margin_lon, latmin - margin_lat, latmax + margin_lat], crs=ccrs.PlateCarree())
+    ax.set_extent([lonmin - margin_lon, lonmax + margin_lon, latmin - margin_lat, latmax + margin_lat], crs=_PLATE_CARREE)
 
     # Map features
-    ax.add_feature(cfeature.LAND.with_scale("50m"), facecolor=land_face, edgecolor=land_face)
-    ax.add_feature(cfeature.COASTLINE.with_scale("50m"), edgecolor=coast_color, linewidth=0.6)
-    ax.add_feature(cfeature.BORDERS.with_scale("50m"), edgecolor=border_color, linestyle=":", linewidth=0.5)
+    ax.add_feature(_LAND_50M, facecolor=land_face, edgecolor=land_face)
+    ax.add_feature(_COAST_50M, edgecolor=coast_color, linewidth=0.6)
+    ax.add_feature(_BORDERS_50M, edgecolor=border_color, linestyle=":", linewidth=0.5)
     gl = ax.gridlines(draw_labels=True, dms=False, x_inline=False, y_inline=False, linewidth=0.4, color=grid_color, alpha=grid_alpha, linestyle="--")
     gl.top_labels = False; gl.right_labels = False
     try:
@@ -302,27 +486,35 @@ def main(hdob_file: str,
         pass
 
     # Plot barbs grouped by color
-    for color, inds in color_groups.items():
+    for bucket in present.tolist():
+        color = tuple(_BUCKET_RGB[bucket])
+        inds = buckets == bucket
         xs = px[inds]; ys = py[inds]; us = uu[inds]; vs = vv[inds]
         # matplotlib barbs interpret u/v in data units; we used knots for u/v
-        ax.barbs(xs, ys, us, vs, length=6, transform=ccrs.PlateCarree(), color=color, linewidth=0.8)
-
-    # MSLP labels — choose text color vs theme
-    for x, y, m in zip(px, py, pm):
-        if m is not None:
-            text = f"{m:.1f}"
-            # place label slightly offset
-            ax.text(x + 0.02, y + 0.02, text, color=text_color, fontsize=8, transform=ccrs.PlateCarree(),
-                    ha="left", va="bottom", bbox={"facecolor":"none","edgecolor":"none","pad":0})
+        ax.barbs(xs, ys, us, vs, length=6, transform=_PLATE_CARREE, color=color, linewidth=0.8)
+
+    # MSLP labels — choose text color vs theme; only points that carry an MSLP. Past 200 of
+    # them the labels pile into an unreadable band, so only every Nth is drawn (~60 labels)
+    has_mslp = np.flatnonzero(~np.isnan(pm))
+    if len(has_mslp) > 200:
+        has_mslp = has_mslp[::len(has_mslp) // 60]
+    # label anchors (slightly offset) projected to map coordinates for all labels at once
+    mslp_xy = ax.projection.transform_points(_PLATE_CARREE, px[has_mslp] + 0.02, py[has_mslp] + 0.02)
+    mslp_labels = [(x, y, f"{m:.1f}")
+                   for (x, y), m in zip(mslp_xy[:, :2].tolist(), pm[has_mslp].tolist())]
+    for x, y, text in mslp_labels:
+        ax.text(x, y, text, color=text_color, fontsize=8, transform=ax.transData,
+                ha="left", va="bottom", bbox={"facecolor":"none","edgecolor":"none","pad":0})
 
     # If requested, annotate coordinates next to the first point (small) or on hover — keep simple: label each barb with lat/lon small
     # To avoid clutter, we annotate only every Nth point based on number of points
     n_points = len(px)
     step = max(1, n_points // 40)  # aim for up to ~40 labels
-    for i in range(0, n_points, step):
-        x = px[i]; y = py[i]
-        coord_text = _format_coord_for_display(y, x, coord_format)  # lat, lon
-        ax.text(x - 0.02, y - 0.02, coord_text, color=text_color, fontsize=7, transform=ccrs.PlateCarree(), ha="right", va="top", alpha=0.9)
+    lx = px[::step]; ly = py[::step]
+    coord_texts = _format_coords_for_display(ly, lx, coord_format)  # lat, lon
+    coord_xy = ax.projection.transform_points(_PLATE_CARREE, lx - 0.02, ly - 0.02)
+    for (x, y), coord_text in zip(coord_xy[:, :2].tolist(), coord_texts):
+        ax.text(x, y, coord_text, color=text_color, fontsize=7, transform=ax.transData, ha="right", va="top", alpha=0.9)
 
     # Legend
     if show_legend:
@@ -354,10 +546,31 @@ def main(hdob_file: str,
     ax.set_title(f"HDOB: {os.path.basename(hdob_file)} — Flight-level winds & MSLP{title_time}", color=text_color)
 
     out_png = os.path.splitext(hdob_file)[0] + ".png"
-    plt.savefig(out_png, dpi=150, facecolor=fig.get_facecolor(), bbox_inches="tight")
+    # fig.savefig, not plt.savefig: pyplot follows the save with a draw_idle, which on Agg
+    # is a third full render of the figure on top of the tight-bbox and output passes
+    fig.savefig(out_png, dpi=150, facecolor=fig.get_facecolor(), bbox_inches="tight")
     print(f"Saved plot: {out_png}")
 
     if show_plot:
         plt.show()
-    else:
-        plt.close(fig)
+    return out_png
+
+def _cli(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point (the GUI launches plots this way, in their own process)."""
+    import argparse
+    ap = argparse.ArgumentParser(description="Plot an HDOB file (flight-level winds & MSLP).")
+    ap.add_argument("hdob_file", help="HDOB text file")
+    ap.add_argument("--start", help="UTC start time-of-day (HH:MM or HHMM or HH:MM:SS or HHMMSS)", default=None)
+    ap.add_argument("--end", help="UTC end time-of-day (HH:MM or HHMM or HH:MM:SS or HHMMSS)", default=None)
+    ap.add_argument("--legend", action="store_true", help="Show the wind-speed color legend")
+    ap.add_argument("--coord-format", choices=("decimal", "dms"), default="decimal")
+    ap.add_argument("--plot-theme", choices=("dark", "light"), default="dark")
+    ap.add_argument("--no-show", action="store_true", help="Only save the PNG, don't open a window")
+    args = ap.parse_args(argv)
+    out_png = main(args.hdob_file, start_utc=args.start, end_utc=args.end, show_legend=args.legend,
+                   coord_format=args.coord_format, plot_theme=args.plot_theme, show_plot=not args.no_show)
+    # non-zero when nothing was drawn, so the GUI can tell the user why
+    return 0 if out_png else 1
+
+if __name__ == "__main__":
+    raise SystemExit(_cli())